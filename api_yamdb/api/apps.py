@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from api.v1 import authentication, autocomplete, cache, user_cache
+        cache.connect_signals()
+        autocomplete.connect_signals()
+        authentication.connect_signals()
+        user_cache.connect_signals()
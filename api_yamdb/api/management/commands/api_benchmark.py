@@ -0,0 +1,193 @@
+import json
+import logging
+import platform
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Comment, CustomUser, Review, Title, UserRole
+
+ENDPOINTS = (
+    ('api-root', 'api-root', {}, ''),
+    ('titles-list', 'titles-list', {}, ''),
+    ('titles-cursor', 'titles-list', {}, '?pagination=cursor'),
+    ('titles-filter', 'titles-list', {}, '?genre={genre}&year={year}'),
+    ('titles-top-rated', 'titles-list', {}, '?ordering=-rating&limit=20'),
+    ('titles-top-rated-cursor', 'titles-list', {},
+     '?ordering=-rating&pagination=cursor&limit=20'),
+    ('titles-detail', 'titles-detail', {'pk': 'title'}, ''),
+    ('reviews-list', 'reviews-list', {'title_id': 'title'}, ''),
+    ('reviews-cursor', 'reviews-list', {'title_id': 'title'},
+     '?pagination=cursor'),
+    ('reviews-detail', 'reviews-detail',
+     {'title_id': 'title', 'pk': 'review'}, ''),
+    ('comments-list', 'comments-list',
+     {'title_id': 'title', 'review_id': 'review'}, ''),
+    ('comments-detail', 'comments-detail',
+     {'title_id': 'title', 'review_id': 'review', 'pk': 'comment'}, ''),
+    ('genres-list', 'genres-list', {}, ''),
+    ('categories-search', 'categories-list', {}, '?search={category}'),
+    ('users-list', 'users-list', {}, ''),
+    ('users-detail', 'users-detail', {'username': 'username'}, ''),
+    ('users-me', 'users-me', {}, ''),
+    ('export', 'export', {'file_name': 'file_name'}, ''),
+    ('metrics', 'metrics', {}, ''),
+)
+ROLES = ('anonymous',) + tuple(role.value for role in UserRole)
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, rank):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, len(ordered) * rank // 100)]
+
+
+def route_names():
+    return {name for name in get_resolver('api.v1.urls').reverse_dict
+            if isinstance(name, str)}
+
+
+class Command(BaseCommand):
+    help = 'Команда для замера скорости эндпоинтов API.' \
+           'Замер выполняется командой python manage.py api_benchmark'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Количество замеряемых запросов на эндпоинт и роль')
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Количество прогревочных запросов')
+        parser.add_argument(
+            '--output',
+            help='Файл для сохранения результатов в формате JSON')
+        parser.add_argument(
+            '--compare',
+            help='Файл с сохранёнными результатами для сравнения')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help='Допустимое относительное ухудшение задержки p95')
+
+    def handle(self, *args, **options):
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        samples = self.get_samples()
+        clients = self.get_clients()
+        results = {}
+        for endpoint, name, kwargs, query in ENDPOINTS:
+            url = reverse(f'api:{name}', kwargs={
+                key: samples[sample] for key, sample in kwargs.items()})
+            url += query.format(**samples)
+            for role, client in clients.items():
+                label = f'{endpoint} [{role}]'
+                results[label] = self.measure(client, url, options)
+                self.print_result(label, results[label])
+        skipped = route_names() - {name for _, name, _, _ in ENDPOINTS}
+        if skipped:
+            print(f'Не замерены (не GET): {", ".join(sorted(skipped))}')
+        report = {'meta': {'python': platform.python_version(),
+                           'database': connection.vendor,
+                           'titles': Title.objects.count(),
+                           'reviews': Review.objects.count(),
+                           'requests': options['requests']},
+                  'results': results}
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+        if options['compare']:
+            self.compare(results, options['compare'], options['threshold'])
+
+    def get_samples(self):
+        title = Title.objects.order_by('-rating_count').first()
+        if title is None:
+            raise CommandError('БД пуста, сначала выполните db_generate')
+        review = Review.objects.filter(title=title).annotate(
+            comment_count=Count('comments')).order_by(
+            '-comment_count').first()
+        comment = Comment.objects.filter(review=review).first()
+        genre = title.genre.first()
+        return {
+            'title': title.pk,
+            'review': review.pk if review else 0,
+            'comment': comment.pk if comment else 0,
+            'genre': genre.slug if genre else '',
+            'year': title.year,
+            'category': title.category.name[:3] if title.category else '',
+            'username': review.author.username if review else '',
+            'file_name': 'genre',
+        }
+
+    def get_clients(self):
+        clients = {'anonymous': APIClient()}
+        for role in ROLES[1:]:
+            user = CustomUser.objects.filter(role=role).first()
+            if user is None:
+                continue
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+            clients[role] = client
+        return clients
+
+    def measure(self, client, url, options):
+        for _ in range(options['warmup']):
+            client.get(url)
+        latencies = []
+        queries = 0
+        statuses = set()
+        started = time.perf_counter()
+        for _ in range(options['requests']):
+            with CaptureQueriesContext(connection) as context:
+                request_started = time.perf_counter()
+                response = client.get(url)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                latencies.append(time.perf_counter() - request_started)
+            queries += len(context.captured_queries)
+            statuses.add(response.status_code)
+        elapsed = time.perf_counter() - started
+        result = {f'p{rank}': percentile(latencies, rank) * 1000
+                  for rank in PERCENTILES}
+        result.update({
+            'rps': options['requests'] / elapsed,
+            'queries': queries / options['requests'],
+            'statuses': sorted(statuses),
+        })
+        return result
+
+    def print_result(self, label, result):
+        print(f'{label:<32} p50 {result["p50"]:8.2f} мс  '
+              f'p95 {result["p95"]:8.2f} мс  p99 {result["p99"]:8.2f} мс  '
+              f'{result["rps"]:8.0f} rps  {result["queries"]:5.1f} SQL  '
+              f'{result["statuses"]}')
+
+    def compare(self, results, path, threshold):
+        with open(path, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = []
+        for label, before in baseline.items():
+            after = results.get(label)
+            if after is None:
+                continue
+            if after['p95'] > before['p95'] * (1 + threshold):
+                regressions.append(
+                    f'{label}: p95 {before["p95"]:.2f} -> '
+                    f'{after["p95"]:.2f} мс')
+            if after['queries'] > before['queries']:
+                regressions.append(
+                    f'{label}: SQL {before["queries"]:.1f} -> '
+                    f'{after["queries"]:.1f}')
+        if regressions:
+            raise CommandError('Найдены регрессии:\n' + '\n'.join(regressions))
+        print('Регрессий не найдено')
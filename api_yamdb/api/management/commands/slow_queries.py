@@ -0,0 +1,52 @@
+import glob
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Команда для отчёта о самых медленных SQL запросах API.' \
+           'Отчёт выводится командой python manage.py slow_queries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            default=settings.SLOW_QUERY_LOG,
+            help='Файл журнала медленных запросов')
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Количество запросов в отчёте')
+
+    def handle(self, *args, **options):
+        queries = defaultdict(lambda: {
+            'count': 0, 'total_ms': 0, 'max_ms': 0, 'views': set(),
+            'plan': None})
+        for path in sorted(glob.glob(f'{options["log"]}*')):
+            with open(path, encoding='utf-8') as log_file:
+                for line in log_file:
+                    entry = json.loads(line)
+                    query = queries[entry['sql']]
+                    query['count'] += 1
+                    query['total_ms'] += entry['duration_ms']
+                    query['max_ms'] = max(query['max_ms'],
+                                          entry['duration_ms'])
+                    query['views'].add(f'{entry["method"]} {entry["view"]}')
+                    query['plan'] = entry['plan'] or query['plan']
+        if not queries:
+            print('Медленных запросов не найдено')
+            return
+        offenders = sorted(queries.items(), key=lambda item: -item[1][
+            'total_ms'])[:options['top']]
+        for number, (sql, query) in enumerate(offenders, 1):
+            print(f'{number}. всего {query["total_ms"]:.1f} мс, '
+                  f'{query["count"]} раз, '
+                  f'в среднем {query["total_ms"] / query["count"]:.1f} мс, '
+                  f'максимум {query["max_ms"]:.1f} мс')
+            print(f'   {", ".join(sorted(query["views"]))}')
+            print(f'   {sql}')
+            for step in query['plan'] or ():
+                print(f'   > {step}')
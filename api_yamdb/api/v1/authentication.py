@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.cache import get_version_cache
+from api.v1.user_cache import user_cache
+from reviews.models import CustomUser
+
+VERSION_CLAIM = 'ver'
+USER_CLAIMS = CustomUser.TOKEN_CLAIM_FIELDS
+
+
+def token_version_key(user_id):
+    return f'token_version:{user_id}'
+
+
+def get_token_version(user_id):
+    key = token_version_key(user_id)
+    version = get_version_cache().get(key)
+    if version is None:
+        version = CustomUser.objects.filter(pk=user_id).values_list(
+            'token_version', flat=True).first()
+        if version is not None:
+            get_version_cache().set(key, version, None)
+    return version
+
+
+def token_for_user(user):
+    token = AccessToken.for_user(user)
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            raise InvalidToken('Токен не содержит идентификатор пользователя')
+        if VERSION_CLAIM not in validated_token:
+            return self.get_cached_user(user_id)
+        if validated_token[VERSION_CLAIM] != get_token_version(user_id):
+            raise AuthenticationFailed('Токен отозван',
+                                       code='token_revoked')
+        if not validated_token['is_active']:
+            raise AuthenticationFailed('Пользователь неактивен',
+                                       code='user_inactive')
+        return CustomUser(
+            pk=user_id,
+            token_version=validated_token[VERSION_CLAIM],
+            **{claim: validated_token[claim] for claim in USER_CLAIMS})
+
+    def get_cached_user(self, user_id):
+        user = user_cache.get(user_id)
+        if user is None:
+            raise AuthenticationFailed('Пользователь не найден',
+                                       code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed('Пользователь неактивен',
+                                       code='user_inactive')
+        return user.as_user()
+
+
+def forget_token_version(sender, instance, **kwargs):
+    key = token_version_key(instance.pk)
+    get_version_cache().delete(key)
+    transaction.on_commit(lambda: get_version_cache().delete(key))
+
+
+def connect_signals():
+    post_save.connect(forget_token_version, sender=CustomUser)
+    post_delete.connect(forget_token_version, sender=CustomUser)
@@ -0,0 +1,308 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from reviews.models import Category, Genre, Review, Title
+
+PREFIX_END = '\U0010ffff'
+
+
+def normalize(value):
+    return ' '.join(value.casefold().split())
+
+
+class PrefixIndex:
+    def __init__(self, loader, max_entries, cache_size=1024,
+                 prefix_length=2, top_size=50):
+        self.loader = loader
+        self.max_entries = max_entries
+        self.cache_size = cache_size
+        self.prefix_length = prefix_length
+        self.top_size = top_size
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.keys = []
+            self.entries = {}
+            self.order = {}
+            self.top = {}
+            self.results = OrderedDict()
+            self.loaded_at = None
+
+    @property
+    def loaded(self):
+        return self.loaded_at is not None
+
+    def load(self):
+        entries = {pk: (normalize(name), score, payload)
+                   for pk, name, score, payload
+                   in self.loader(self.max_entries)}
+        keys = sorted((key, pk) for pk, (key, _, _) in entries.items())
+        order = {pk: self.sort_key(pk, key, score)
+                 for pk, (key, score, _) in entries.items()}
+        top = {}
+        for sort_key in sorted(order.values()):
+            for prefix in self.short_prefixes(sort_key[-2]):
+                items = top.setdefault(prefix, [])
+                if len(items) < self.top_size:
+                    items.append(sort_key)
+        with self.lock:
+            self.keys = keys
+            self.entries = entries
+            self.order = order
+            self.top = top
+            self.results.clear()
+            self.loaded_at = time.monotonic()
+
+    def ensure_loaded(self):
+        interval = settings.AUTOCOMPLETE_REBUILD_INTERVAL
+        if (not self.loaded
+                or time.monotonic() - self.loaded_at > interval):
+            self.load()
+
+    def short_prefixes(self, key):
+        return [key[:length] for length
+                in range(1, min(len(key), self.prefix_length) + 1)]
+
+    def _scan(self, prefix, limit):
+        start = bisect_left(self.keys, (prefix,))
+        stop = bisect_left(self.keys, (prefix + PREFIX_END,), start)
+        return heapq.nsmallest(
+            limit,
+            (self.keys[position][1] for position in range(start, stop)),
+            key=self.order.__getitem__)
+
+    def _rescan_top(self, prefix):
+        items = [self.order[pk] for pk in self._scan(prefix, self.top_size)]
+        if items:
+            self.top[prefix] = items
+        else:
+            self.top.pop(prefix, None)
+
+    def _insert_top(self, prefix, sort_key):
+        items = self.top.setdefault(prefix, [])
+        position = bisect_left(items, sort_key)
+        items.insert(position, sort_key)
+        if len(items) > self.top_size:
+            items.pop()
+        return position
+
+    def _discard_top(self, prefix, sort_key):
+        items = self.top.get(prefix, [])
+        position = bisect_left(items, sort_key)
+        if position == len(items) or items[position] != sort_key:
+            return False
+        del items[position]
+        if not items:
+            del self.top[prefix]
+        return True
+
+    def _remove(self, pk):
+        entry = self.entries.pop(pk, None)
+        if entry is None:
+            return
+        sort_key = self.order.pop(pk)
+        position = bisect_left(self.keys, (entry[0], pk))
+        del self.keys[position]
+        for prefix in self.short_prefixes(entry[0]):
+            was_full = len(self.top.get(prefix, ())) == self.top_size
+            if self._discard_top(prefix, sort_key) and was_full:
+                self._rescan_top(prefix)
+
+    def update(self, pk, name, score, payload):
+        with self.lock:
+            if not self.loaded:
+                return
+            if (pk not in self.entries
+                    and len(self.entries) >= self.max_entries):
+                return
+            if pk in self.entries:
+                self.forget(self.entries[pk][0])
+                self._remove(pk)
+            key = normalize(name)
+            insort(self.keys, (key, pk))
+            self.entries[pk] = (key, score, payload)
+            self.order[pk] = self.sort_key(pk, key, score)
+            for prefix in self.short_prefixes(key):
+                self._insert_top(prefix, self.order[pk])
+            self.forget(key)
+
+    def update_score(self, pk, score):
+        with self.lock:
+            entry = self.entries.get(pk)
+            if entry is None:
+                return
+            old_order = self.order[pk]
+            self.entries[pk] = (entry[0], score, entry[2])
+            self.order[pk] = self.sort_key(pk, entry[0], score)
+            for prefix in self.short_prefixes(entry[0]):
+                was_full = len(self.top.get(prefix, ())) == self.top_size
+                removed = self._discard_top(prefix, old_order)
+                position = self._insert_top(prefix, self.order[pk])
+                if removed and was_full and position == self.top_size - 1:
+                    self._rescan_top(prefix)
+            self.forget(entry[0])
+
+    def remove(self, pk):
+        with self.lock:
+            entry = self.entries.get(pk)
+            if entry is None:
+                return
+            self._remove(pk)
+            self.forget(entry[0])
+
+    def lookup(self, prefix, limit):
+        self.ensure_loaded()
+        prefix = normalize(prefix)
+        with self.lock:
+            if len(prefix) <= self.prefix_length and limit <= self.top_size:
+                return [self.entries[sort_key[-1]][2]
+                        for sort_key in self.top.get(prefix, [])[:limit]]
+            cached = self.results.get((prefix, limit))
+            if cached is not None:
+                self.results.move_to_end((prefix, limit))
+                return cached
+            results = [self.entries[pk][2]
+                       for pk in self._scan(prefix, limit)]
+            self.results[(prefix, limit)] = results
+            if len(self.results) > self.cache_size:
+                self.results.popitem(last=False)
+            return results
+
+    def forget(self, key):
+        for cached in [cached for cached in self.results
+                       if key.startswith(cached[0])]:
+            del self.results[cached]
+
+    @staticmethod
+    def sort_key(pk, key, score):
+        return tuple(-value for value in score) + (key, pk)
+
+
+def title_score(rating, rating_count):
+    return (-1 if rating is None else rating, rating_count)
+
+
+def load_titles(limit):
+    titles = Title.objects.order_by(
+        F('rating').desc(nulls_last=True), '-rating_count', 'id',
+    ).values_list('id', 'name', 'rating', 'rating_count')[:limit]
+    for pk, name, rating, rating_count in titles.iterator():
+        yield (pk, name, title_score(rating, rating_count),
+               {'id': pk, 'name': name})
+
+
+def slug_loader(model):
+    def load(limit):
+        objects = model.objects.annotate(
+            popularity=Count('titles'),
+        ).order_by('-popularity', 'id').values_list(
+            'id', 'name', 'slug', 'popularity')[:limit]
+        for pk, name, slug, popularity in objects.iterator():
+            yield pk, name, (popularity,), {'name': name, 'slug': slug}
+    return load
+
+
+INDEXES = {
+    'titles': PrefixIndex(load_titles, settings.AUTOCOMPLETE_MAX_ENTRIES),
+    'genres': PrefixIndex(slug_loader(Genre),
+                          settings.AUTOCOMPLETE_MAX_ENTRIES),
+    'categories': PrefixIndex(slug_loader(Category),
+                              settings.AUTOCOMPLETE_MAX_ENTRIES),
+}
+SLUG_INDEXES = {Genre: INDEXES['genres'], Category: INDEXES['categories']}
+
+
+def reset():
+    for index in INDEXES.values():
+        index.reset()
+
+
+def refresh_title_score(title_id):
+    index = INDEXES['titles']
+    if not index.loaded:
+        return
+    values = Title.objects.filter(pk=title_id).values_list(
+        'rating', 'rating_count').first()
+    if values is not None:
+        index.update_score(title_id, title_score(*values))
+
+
+def refresh_popularity(model, pks):
+    index = SLUG_INDEXES[model]
+    if not index.loaded:
+        return
+    popularity = model.objects.filter(pk__in=pks).annotate(
+        popularity=Count('titles')).values_list('id', 'popularity')
+    for pk, count in popularity:
+        index.update_score(pk, (count,))
+
+
+def on_title_save(sender, instance, **kwargs):
+    INDEXES['titles'].update(
+        instance.pk, instance.name,
+        title_score(instance.rating, instance.rating_count),
+        {'id': instance.pk, 'name': instance.name})
+    if instance.category_id is not None:
+        transaction.on_commit(
+            lambda: refresh_popularity(Category, [instance.category_id]))
+
+
+def on_title_delete(sender, instance, **kwargs):
+    INDEXES['titles'].remove(instance.pk)
+    if instance.category_id is not None:
+        transaction.on_commit(
+            lambda: refresh_popularity(Category, [instance.category_id]))
+
+
+def on_review_change(sender, instance, **kwargs):
+    transaction.on_commit(lambda: refresh_title_score(instance.title_id))
+
+
+def on_slug_save(sender, instance, **kwargs):
+    SLUG_INDEXES[sender].update(
+        instance.pk, instance.name, (instance.titles.count(),),
+        {'name': instance.name, 'slug': instance.slug})
+
+
+def on_slug_delete(sender, instance, **kwargs):
+    SLUG_INDEXES[sender].remove(instance.pk)
+
+
+def on_title_genre_change(sender, instance, action, reverse, pk_set,
+                          **kwargs):
+    if reverse:
+        pks = [instance.pk]
+    elif action == 'pre_clear':
+        pks = list(instance.genre.values_list('id', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        pks = list(pk_set)
+    else:
+        return
+    transaction.on_commit(lambda: refresh_popularity(Genre, pks))
+
+
+def on_title_genre_delete(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: refresh_popularity(Genre, [instance.genre_id]))
+
+
+def connect_signals():
+    post_save.connect(on_title_save, sender=Title)
+    post_delete.connect(on_title_delete, sender=Title)
+    post_save.connect(on_review_change, sender=Review)
+    post_delete.connect(on_review_change, sender=Review)
+    for model in SLUG_INDEXES:
+        post_save.connect(on_slug_save, sender=model)
+        post_delete.connect(on_slug_delete, sender=model)
+    m2m_changed.connect(on_title_genre_change, sender=Title.genre.through)
+    post_delete.connect(on_title_genre_delete, sender=Title.genre.through)
@@ -0,0 +1,107 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+
+from reviews.models import (Category, Comment, CustomUser, Genre, Review,
+                            Title)
+
+CACHE_ALIAS = 'api'
+VERSION_CACHE_ALIAS = 'versions'
+
+MODEL_COLLECTIONS = {
+    Title: ('titles',),
+    Review: ('titles', 'reviews:{title_id}'),
+    Comment: ('comments:{review_id}',),
+    Genre: ('genres', 'titles'),
+    Category: ('categories', 'titles'),
+}
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_version_cache():
+    return caches[VERSION_CACHE_ALIAS]
+
+
+def generation_key(collection):
+    return f'generation:{collection}'
+
+
+def get_generation(collection):
+    return get_version_cache().get_or_set(
+        generation_key(collection), time.time_ns, None)
+
+
+def invalidate(*collections):
+    get_version_cache().set_many(
+        {generation_key(name): time.time_ns() for name in collections},
+        None)
+
+
+def path_digest(request):
+    return hashlib.md5(request.get_full_path().encode()).hexdigest()
+
+
+def response_key(request, collection, generation):
+    user = request.user
+    role = user.role if user.is_authenticated else 'anonymous'
+    return (f'response:{collection}:{generation}:'
+            f'{role}:{path_digest(request)}')
+
+
+def response_etag(request, generation):
+    return f'"{generation:x}-{path_digest(request)}"'
+
+
+def response_last_modified(generation):
+    return -(-generation // 10 ** 9)
+
+
+def invalidate_on_change(sender, instance, **kwargs):
+    collections = [name.format(**vars(instance))
+                   for name in MODEL_COLLECTIONS[sender]]
+    invalidate(*collections)
+    transaction.on_commit(lambda: invalidate(*collections))
+
+
+def invalidate_on_genre_change(sender, **kwargs):
+    invalidate('titles')
+    transaction.on_commit(lambda: invalidate('titles'))
+
+
+def remember_username(sender, instance, raw=False, **kwargs):
+    instance._old_username = None
+    if not raw and not instance._state.adding:
+        instance._old_username = CustomUser.objects.filter(
+            pk=instance.pk).values_list('username', flat=True).first()
+
+
+def invalidate_on_rename(sender, instance, created, **kwargs):
+    old_username = getattr(instance, '_old_username', None)
+    if created or old_username in (None, instance.username):
+        return
+    title_ids = Review.objects.filter(author=instance).values_list(
+        'title_id', flat=True).distinct()
+    review_ids = Comment.objects.filter(author=instance).values_list(
+        'review_id', flat=True).distinct()
+    collections = ([f'reviews:{pk}' for pk in title_ids]
+                   + [f'comments:{pk}' for pk in review_ids])
+    if collections:
+        invalidate(*collections)
+        transaction.on_commit(lambda: invalidate(*collections))
+
+
+def connect_signals():
+    for model in MODEL_COLLECTIONS:
+        post_save.connect(invalidate_on_change, sender=model)
+        post_delete.connect(invalidate_on_change, sender=model)
+    pre_save.connect(remember_username, sender=CustomUser)
+    post_save.connect(invalidate_on_rename, sender=CustomUser)
+    m2m_changed.connect(invalidate_on_genre_change,
+                        sender=Title.genre.through)
@@ -1,7 +1,23 @@
+import re
+
+from django.db import connection
+from django.db.models import CharField, Count, F, FloatField, Func, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
 from reviews.models import Title
 
+YEAR_BUCKET = 10
+
+
+def full_text_query(value):
+    words = re.findall(r'\w+', value)
+    if not words:
+        return ''
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
 
 class TitleFilter(filters.FilterSet):
     genre = filters.CharFilter(field_name='genre__slug')
@@ -12,3 +28,114 @@ class TitleFilter(filters.FilterSet):
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year')
+
+
+class TitleOrderingFilter(OrderingFilter):
+    ordering_fields = {
+        'rating': 'rating',
+        'year': 'year',
+        'name': 'name',
+        'reviews': 'rating_count',
+    }
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param, '')
+        ordering = []
+        for term in params.split(','):
+            term = term.strip()
+            field = self.ordering_fields.get(term.lstrip('-'))
+            if field is not None:
+                ordering.append(f'-{field}' if term[0] == '-' else field)
+        if not ordering:
+            return None
+        ordering.append('-id' if ordering[0][0] == '-' else 'id')
+        return ordering
+
+
+class RowSubquery(RawSQL):
+    def as_sql(self, compiler, connection):
+        return self.sql, self.params
+
+
+class SearchRank(Func):
+    template = '(SELECT rank FROM %(fts)s WHERE %(expressions)s)'
+    arg_joiner = ' AND rowid = '
+    output_field = FloatField()
+
+    def __init__(self, fts, query):
+        super().__init__(
+            RawSQL(f'{fts} MATCH %s', [query]), F('pk'), fts=fts)
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = full_text_query(request.query_params.get(
+            self.search_param, ''))
+        if not query or connection.vendor != 'sqlite':
+            return queryset
+        fts = f'{queryset.model._meta.db_table}_fts'
+        return queryset.filter(pk__in=RowSubquery(
+            f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [query]),
+        ).annotate(
+            search_rank=SearchRank(fts, query),
+        ).order_by('search_rank', 'pk')
+
+
+def genre_facet(queryset):
+    return Title.genre.through.objects.filter(
+        title__in=queryset.values('id'),
+    ).values(
+        facet=Value('genre', CharField()),
+        key=F('genre__slug'),
+        label=F('genre__name'),
+    ).annotate(count=Count('title_id'))
+
+
+def category_facet(queryset):
+    return queryset.filter(category__isnull=False).values(
+        facet=Value('category', CharField()),
+        key=F('category__slug'),
+        label=F('category__name'),
+    ).annotate(count=Count('id'))
+
+
+def year_facet(queryset):
+    return queryset.values(
+        facet=Value('year', CharField()),
+        key=Cast(F('year') / YEAR_BUCKET * YEAR_BUCKET, CharField()),
+        label=Value('', CharField()),
+    ).annotate(count=Count('id'))
+
+
+def slug_facet_item(row):
+    return {'slug': row['key'], 'name': row['label'], 'count': row['count']}
+
+
+def year_facet_item(row):
+    start = int(row['key'])
+    return {'from': start, 'to': start + YEAR_BUCKET - 1,
+            'count': row['count']}
+
+
+TITLE_FACETS = {
+    'genre': (genre_facet, slug_facet_item),
+    'category': (category_facet, slug_facet_item),
+    'year': (year_facet, year_facet_item),
+}
+
+
+def title_facets(queryset, names):
+    queryset = queryset.order_by()
+    queries = [TITLE_FACETS[name][0](queryset).order_by() for name in names]
+    rows = queries[0].union(*queries[1:], all=True)
+    facets = {name: [] for name in names}
+    for row in rows:
+        facets[row['facet']].append(TITLE_FACETS[row['facet']][1](row))
+    for name, items in facets.items():
+        if name == 'year':
+            items.sort(key=lambda item: item['from'])
+        else:
+            items.sort(key=lambda item: (-item['count'], item['slug']))
+    return facets
@@ -0,0 +1,154 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db import connection
+from rest_framework.serializers import ListSerializer, ModelSerializer
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_local = threading.local()
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.sql_queries = 0
+        self.sql_time = 0
+        self.serializer_time = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.sql_queries += 1
+
+
+class RouteMetrics:
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.duration = 0
+        self.count = 0
+        self.sql_queries = 0
+        self.sql_time = 0
+        self.serializer_time = 0
+        self.response_bytes = 0
+        self.statuses = defaultdict(int)
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = defaultdict(RouteMetrics)
+
+    def observe(self, route, method, status, duration, metrics, size):
+        with self.lock:
+            route_metrics = self.routes[route, method]
+            route_metrics.buckets[bisect_left(BUCKETS, duration)] += 1
+            route_metrics.duration += duration
+            route_metrics.count += 1
+            route_metrics.sql_queries += metrics.sql_queries
+            route_metrics.sql_time += metrics.sql_time
+            route_metrics.serializer_time += metrics.serializer_time
+            route_metrics.response_bytes += size
+            route_metrics.statuses[status] += 1
+
+    def clear(self):
+        with self.lock:
+            self.routes.clear()
+
+    def render(self):
+        lines = [
+            '# HELP api_request_duration_seconds Время обработки запроса.',
+            '# TYPE api_request_duration_seconds histogram',
+        ]
+        totals = {
+            'api_sql_queries_total': 'sql_queries',
+            'api_sql_duration_seconds_total': 'sql_time',
+            'api_serializer_duration_seconds_total': 'serializer_time',
+            'api_response_bytes_total': 'response_bytes',
+        }
+        with self.lock:
+            routes = sorted(self.routes.items())
+            for (route, method), metrics in routes:
+                labels = f'route="{route}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ('+Inf',), metrics.buckets):
+                    cumulative += count
+                    lines.append(f'api_request_duration_seconds_bucket'
+                                 f'{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'api_request_duration_seconds_sum{{{labels}}} '
+                             f'{metrics.duration}')
+                lines.append(f'api_request_duration_seconds_count'
+                             f'{{{labels}}} {metrics.count}')
+            for name, attribute in totals.items():
+                lines.append(f'# TYPE {name} counter')
+                lines.extend(
+                    f'{name}{{route="{route}",method="{method}"}} '
+                    f'{getattr(metrics, attribute)}'
+                    for (route, method), metrics in routes)
+            lines.append('# TYPE api_responses_total counter')
+            for (route, method), metrics in routes:
+                lines.extend(
+                    f'api_responses_total{{route="{route}",method="{method}",'
+                    f'status="{status}"}} {count}'
+                    for status, count in sorted(metrics.statuses.items()))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = _local.metrics = RequestMetrics()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            _local.metrics = None
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        route = match.url_name if match and match.url_name else 'unresolved'
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(route, request.method, response.status_code,
+                         duration, metrics, size)
+        return response
+
+
+class TimedDataMixin:
+
+    @property
+    def data(self):
+        metrics = getattr(_local, 'metrics', None)
+        if metrics is None:
+            return super().data
+        started = time.perf_counter()
+        try:
+            return super().data
+        finally:
+            metrics.serializer_time += time.perf_counter() - started
+
+
+class TimedListSerializer(TimedDataMixin, ListSerializer):
+    pass
+
+
+class TimedModelSerializer(TimedDataMixin, ModelSerializer):
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        serializer = super().many_init(*args, **kwargs)
+        if type(serializer) is ListSerializer:
+            serializer.__class__ = TimedListSerializer
+        return serializer
@@ -0,0 +1,97 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from api.v1.cache import (get_cache, get_generation, response_etag,
+                          response_key, response_last_modified)
+
+
+class CursorPaginationMixin:
+    cursor_pagination_class = None
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return (self.cursor_pagination_class is not None
+                and (params.get('pagination') == 'cursor'
+                     or 'cursor' in params))
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.use_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+
+class FacetedListMixin:
+    facets = ()
+    facets_param = 'facets'
+    facet_function = None
+
+    def get_facet_names(self):
+        value = self.request.query_params.get(self.facets_param, '')
+        names = [name for name in value.split(',') if name]
+        unknown = set(names) - set(self.facets)
+        if unknown:
+            raise ValidationError({self.facets_param: (
+                f'Доступные фасеты: {", ".join(self.facets)}')})
+        return list(dict.fromkeys(names))
+
+    def list(self, request, *args, **kwargs):
+        names = self.get_facet_names()
+        response = super().list(request, *args, **kwargs)
+        if names and isinstance(response.data, dict):
+            response.data['facets'] = self.facet_function(
+                self.filter_queryset(self.get_queryset()), names)
+        return response
+
+
+class ConditionalGetMixin:
+    cache_collection = None
+    cache_responses = False
+    cache_timeout = 300
+
+    def get_cache_collection(self):
+        return self.cache_collection.format(**self.kwargs)
+
+    def cached_response(self, key, handler, request, *args, **kwargs):
+        data = get_cache().get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            get_cache().set(key, response.data, self.cache_timeout)
+        return response
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        collection = self.get_cache_collection()
+        generation = get_generation(collection)
+        etag = response_etag(request, generation)
+        last_modified = response_last_modified(generation)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return response
+        if self.cache_responses:
+            key = response_key(request, collection, generation)
+            response = self.cached_response(
+                key, handler, request, *args, **kwargs)
+        else:
+            response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs)
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs)
@@ -14,7 +14,7 @@ class ReadOnlyOrIsAdminOrModeratorOrAuthor(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         return (request.method in SAFE_METHODS
-                or obj.author == request.user
+                or obj.author_id == request.user.pk
                 or request.user.is_admin
                 or request.user.is_superuser
                 or request.user.is_moderator)
@@ -0,0 +1,151 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+PROFILE_MODES = ('pstats', 'collapsed', 'inline')
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+SAMPLE_INTERVAL = 0.001
+PHASES = {
+    'authentication': (('rest_framework/views.py', 'perform_authentication'),),
+    'permissions': (('rest_framework/views.py', 'check_permissions'),
+                    ('rest_framework/views.py', 'check_object_permissions')),
+    'filtering': (('rest_framework/generics.py', 'filter_queryset'),),
+    'pagination': (('rest_framework/pagination.py', 'paginate_queryset'),),
+    'orm': (('django/db/models/sql/compiler.py', 'execute_sql'),),
+    'serialization': (('api/v1/metrics.py', 'data'),),
+    'rendering': (('rest_framework/response.py', 'rendered_content'),),
+}
+
+
+def get_profile_mode(request):
+    mode = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+    if mode in PROFILE_MODES:
+        return mode
+    return None
+
+
+def is_staff_request(request):
+    drf_request = Request(request, authenticators=[
+        authenticator() for authenticator
+        in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        user = drf_request.user
+    except APIException:
+        return False
+    return user.is_authenticated and user.is_admin
+
+
+def phase_times(stats):
+    times = dict.fromkeys(PHASES, 0)
+    for (filename, _, function), (_, _, _, cumulative, _) in (
+            stats.stats.items()):
+        filename = filename.replace(os.sep, '/')
+        for phase, functions in PHASES.items():
+            if any(filename.endswith(path) and function == name
+                   for path, name in functions):
+                times[phase] += cumulative
+    return times
+
+
+def profile_path(request, extension):
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    match = request.resolver_match
+    route = match.url_name if match and match.url_name else 'unresolved'
+    name = f'{time.strftime("%Y%m%d-%H%M%S")}-{route}-{uuid.uuid4().hex[:8]}'
+    return os.path.join(settings.PROFILE_DIR, f'{name}.{extension}')
+
+
+class StackSampler:
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread_id = threading.get_ident()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}'
+                             f':{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n'
+                       for stack, count in self.stacks.most_common())
+
+
+class ProfilerMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = get_profile_mode(request)
+        if mode is None or not is_staff_request(request):
+            return self.get_response(request)
+        if mode == 'collapsed':
+            return self.sample(request)
+        profiler = cProfile.Profile()
+        response = profiler.runcall(self.get_response, request)
+        stats = pstats.Stats(profiler)
+        times = phase_times(stats)
+        if mode == 'inline':
+            return HttpResponse(self.report(stats, times),
+                                content_type='text/plain; charset=utf-8')
+        path = profile_path(request, 'prof')
+        stats.dump_stats(path)
+        return self.annotate(response, path, times)
+
+    def sample(self, request):
+        with StackSampler() as sampler:
+            response = self.get_response(request)
+        path = profile_path(request, 'collapsed')
+        with open(path, 'w', encoding='utf-8') as profile_file:
+            profile_file.write(sampler.collapsed())
+        return self.annotate(response, path, {})
+
+    def annotate(self, response, path, times):
+        response['X-Profile-File'] = path
+        if times:
+            response['X-Profile-Phases'] = ', '.join(
+                f'{phase}={seconds * 1000:.2f}ms'
+                for phase, seconds in times.items())
+        return response
+
+    def report(self, stats, times):
+        output = io.StringIO()
+        output.write('Время по этапам (мс, включая вложенные вызовы):\n')
+        for phase, seconds in times.items():
+            output.write(f'  {phase:<16}{seconds * 1000:10.2f}\n')
+        output.write('\n')
+        stats.stream = output
+        stats.sort_stats('cumulative').print_stats(40)
+        return output.getvalue()
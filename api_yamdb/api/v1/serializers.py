@@ -1,12 +1,35 @@
 from rest_framework.relations import PrimaryKeyRelatedField
-from rest_framework.serializers import (CharField, IntegerField,
-                                        ModelSerializer, SlugRelatedField,
-                                        ValidationError, StringRelatedField)
+from rest_framework.serializers import (CharField, IntegerField, ReadOnlyField,
+                                        SlugRelatedField, ValidationError)
 
+from api.v1.metrics import TimedListSerializer, TimedModelSerializer
+from api.v1.user_cache import user_cache
 from reviews.models import Category, Comment, CustomUser, Genre, Review, Title
 
 
-class SignupSerializer(ModelSerializer):
+def has_loaded_author(instance):
+    field = instance._meta.get_field('author')
+    return (field.is_cached(instance)
+            and not instance.author._state.adding)
+
+
+class AuthorField(ReadOnlyField):
+    def get_attribute(self, instance):
+        if has_loaded_author(instance):
+            return user_cache.add(instance.author).username
+        user = user_cache.get(instance.author_id)
+        return user.username if user is not None else None
+
+
+class AuthorListSerializer(TimedListSerializer):
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        user_cache.get_many(item.author_id for item in items
+                            if not has_loaded_author(item))
+        return super().to_representation(items)
+
+
+class SignupSerializer(TimedModelSerializer):
     class Meta:
         model = CustomUser
         fields = ('username', 'email')
@@ -18,7 +41,7 @@ class SignupSerializer(ModelSerializer):
         return value
 
 
-class TokenSerializer(ModelSerializer):
+class TokenSerializer(TimedModelSerializer):
     confirmation_code = CharField(max_length=50, required=True)
     username = CharField()
 
@@ -27,36 +50,36 @@ class TokenSerializer(ModelSerializer):
         fields = ('username', 'confirmation_code')
 
 
-class UserSerializer(ModelSerializer):
+class UserSerializer(TimedModelSerializer):
     class Meta:
         model = CustomUser
         fields = ('username', 'email', 'first_name',
                   'last_name', 'bio', 'role')
 
 
-class GenreSerializer(ModelSerializer):
+class GenreSerializer(TimedModelSerializer):
     class Meta:
         model = Genre
         fields = ('name', 'slug')
 
 
-class CategorySerializer(ModelSerializer):
+class CategorySerializer(TimedModelSerializer):
     class Meta:
         model = Category
         fields = ('name', 'slug')
 
 
-class TitleSerializer(ModelSerializer):
+class TitleSerializer(TimedModelSerializer):
     genre = GenreSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
-    rating = IntegerField()
+    rating = IntegerField(read_only=True)
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count')
 
 
-class TitleCreateSerializer(ModelSerializer):
+class TitleCreateSerializer(TimedModelSerializer):
     category = SlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all())
@@ -67,19 +90,17 @@ class TitleCreateSerializer(ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating', 'rating_sum', 'rating_count')
 
 
-class ReviewSerializer(ModelSerializer):
-    author = SlugRelatedField(
-        slug_field='username',
-        read_only=True
-    )
+class ReviewSerializer(TimedModelSerializer):
+    author = AuthorField()
     title = PrimaryKeyRelatedField(read_only=True)
 
     class Meta:
         model = Review
         fields = '__all__'
+        list_serializer_class = AuthorListSerializer
 
     def validate(self, data):
         if self.context['request'].method != 'POST':
@@ -94,9 +115,10 @@ class ReviewSerializer(ModelSerializer):
         return data
 
 
-class CommentSerializer(ModelSerializer):
-    author = StringRelatedField(read_only=True, required=False)
+class CommentSerializer(TimedModelSerializer):
+    author = AuthorField()
 
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date',)
+        list_serializer_class = AuthorListSerializer
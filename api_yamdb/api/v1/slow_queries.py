@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+import time
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+logger = logging.getLogger('api.slow_queries')
+logger.propagate = False
+
+
+def get_logger():
+    path = os.path.abspath(settings.SLOW_QUERY_LOG)
+    if logger.handlers and logger.handlers[0].baseFilename != path:
+        logger.removeHandler(logger.handlers[0])
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        logger.addHandler(RotatingFileHandler(
+            path,
+            maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=settings.SLOW_QUERY_LOG_BACKUP_COUNT,
+            encoding='utf-8'))
+        logger.setLevel(logging.INFO)
+    return logger
+
+
+def explain(db_connection, sql, params):
+    if db_connection.vendor != 'sqlite' or not sql.lstrip().upper(
+    ).startswith('SELECT'):
+        return None
+    from django.db.backends.sqlite3.base import SQLiteCursorWrapper
+    cursor = db_connection.connection.cursor(factory=SQLiteCursorWrapper)
+    try:
+        with db_connection.wrap_database_errors:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+    except DatabaseError:
+        return None
+    finally:
+        cursor.close()
+
+
+class SlowQueryLogger:
+
+    def __init__(self, request):
+        self.request = request
+        self.threshold = settings.SLOW_QUERY_THRESHOLD
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+        if duration >= self.threshold:
+            self.log(sql, params, many, context, duration)
+        return result
+
+    def log(self, sql, params, many, context, duration):
+        match = self.request.resolver_match
+        if match is None or match.namespace != 'api':
+            return
+        get_logger().info(json.dumps({
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'view': match.view_name,
+            'method': self.request.method,
+            'path': self.request.get_full_path(),
+            'duration_ms': round(duration * 1000, 3),
+            'sql': sql,
+            'params': None if many else params,
+            'plan': None if many else explain(
+                context['connection'], sql, params),
+        }, ensure_ascii=False, default=str))
+
+
+class SlowQueryMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with connection.execute_wrapper(SlowQueryLogger(request)):
+            return self.get_response(request)
@@ -0,0 +1,76 @@
+import os
+import pickle
+import sqlite3
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+BUSY_TIMEOUT = 5
+SCHEMA = ('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, '
+          'value BLOB NOT NULL, expires REAL) WITHOUT ROWID')
+
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.location = location
+        self._connection = None
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.location)),
+                        exist_ok=True)
+            connection = sqlite3.connect(
+                self.location, timeout=BUSY_TIMEOUT,
+                isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def get(self, key, default=None, version=None):
+        row = self.connection.execute(
+            'SELECT value, expires FROM cache WHERE key = ?',
+            (self._key(key, version),)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return default
+        return pickle.loads(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.connection.execute(
+            'INSERT OR REPLACE INTO cache VALUES (?, ?, ?)',
+            (self._key(key, version), pickle.dumps(value),
+             self.get_backend_timeout(timeout)))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        cursor = self.connection.execute(
+            'INSERT INTO cache VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE '
+            'SET value = excluded.value, expires = excluded.expires '
+            'WHERE expires IS NOT NULL AND expires <= ?',
+            (self._key(key, version), pickle.dumps(value),
+             self.get_backend_timeout(timeout), time.time()))
+        return cursor.rowcount == 1
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [(self._key(key, version), pickle.dumps(value), expires)
+                for key, value in data.items()]
+        with self.connection:
+            self.connection.execute('BEGIN')
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?)', rows)
+        return []
+
+    def delete(self, key, version=None):
+        self.connection.execute('DELETE FROM cache WHERE key = ?',
+                                (self._key(key, version),))
+
+    def clear(self):
+        self.connection.execute('DELETE FROM cache')
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+class MemoryBuckets:
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+
+    def consume(self, key, capacity, rate):
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, now))
+            tokens, wait = take_token(tokens, updated, now, capacity, rate)
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheBuckets:
+    def __init__(self, alias):
+        self.alias = alias
+
+    def consume(self, key, capacity, rate):
+        cache = caches[self.alias]
+        now = time.time()
+        tokens, updated = cache.get(f'throttle:{key}', (capacity, now))
+        tokens, wait = take_token(tokens, updated, now, capacity, rate)
+        cache.set(f'throttle:{key}', (tokens, now), capacity / rate)
+        return wait
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+def take_token(tokens, updated, now, capacity, rate):
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, None
+    return tokens, (1 - tokens) / rate
+
+
+def parse_rate(rate):
+    count, period = rate.split('/')
+    return int(count), DURATIONS[period[0]]
+
+
+def get_buckets():
+    if settings.THROTTLE_CACHE is not None:
+        return CacheBuckets(settings.THROTTLE_CACHE)
+    return memory_buckets
+
+
+memory_buckets = MemoryBuckets(settings.THROTTLE_MAX_KEYS)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+    methods = None
+
+    def __init__(self):
+        self.capacity, duration = parse_rate(
+            api_settings.DEFAULT_THROTTLE_RATES[self.scope])
+        self.rate = self.capacity / duration
+        self.wait_time = None
+
+    def get_keys(self, request):
+        keys = [f'{self.scope}:ip:{self.get_ident(request)}']
+        if request.user and request.user.is_authenticated:
+            keys.append(f'{self.scope}:user:{request.user.pk}')
+        return keys
+
+    def allow_request(self, request, view):
+        if self.methods is not None and request.method not in self.methods:
+            return True
+        buckets = get_buckets()
+        for key in self.get_keys(request):
+            wait = buckets.consume(key, self.capacity, self.rate)
+            if wait is not None:
+                self.wait_time = wait
+                return False
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class SignupThrottle(TokenBucketThrottle):
+    scope = 'signup'
+
+
+class TokenThrottle(TokenBucketThrottle):
+    scope = 'token'
+
+
+class WriteThrottle(TokenBucketThrottle):
+    scope = 'write'
+    methods = ('POST',)
@@ -1,9 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (APISignup, CategoryViewSet, CommentViewSet,
-                    CreateToken, CustomUserViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet)
+from .views import (APISignup, Autocomplete, CategoryViewSet, CommentViewSet,
+                    CreateToken, CustomUserViewSet, DataExport,
+                    GenreViewSet, Metrics, ReviewViewSet, TitleViewSet)
 
 app_name = 'api'
 router = DefaultRouter()
@@ -47,4 +47,16 @@ token_auth_urls = [
 urlpatterns = [
     path('', include(router.urls)),
     path('', include(token_auth_urls)),
+    path(
+        'export/<str:file_name>/',
+        DataExport.as_view(),
+        name='export'),
+    path(
+        'autocomplete/',
+        Autocomplete.as_view(),
+        name='autocomplete'),
+    path(
+        'metrics/',
+        Metrics.as_view(),
+        name='metrics'),
 ]
@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from reviews.models import CustomUser
+
+USER_FIELDS = CustomUser.TOKEN_CLAIM_FIELDS + ('token_version',)
+
+
+class CachedUser(namedtuple('CachedUser', ('id',) + USER_FIELDS)):
+    def as_user(self):
+        return CustomUser(pk=self.id, **{
+            field: getattr(self, field) for field in USER_FIELDS})
+
+
+class UserCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.users = OrderedDict()
+        self.generation = 0
+
+    def get_many(self, user_ids):
+        found = {}
+        missing = set()
+        with self.lock:
+            generation = self.generation
+            for user_id in set(user_ids):
+                user = self.users.get(user_id)
+                if user is None:
+                    missing.add(user_id)
+                else:
+                    self.users.move_to_end(user_id)
+                    found[user_id] = user
+        if not missing:
+            return found
+        rows = CustomUser.objects.filter(pk__in=missing).order_by(
+        ).values_list('id', *USER_FIELDS)
+        loaded = {row[0]: CachedUser(*row) for row in rows}
+        with self.lock:
+            if generation == self.generation:
+                self.users.update(loaded)
+                while len(self.users) > self.max_size:
+                    self.users.popitem(last=False)
+        found.update(loaded)
+        return found
+
+    def add(self, user):
+        cached = CachedUser(user.pk, *(
+            getattr(user, field) for field in USER_FIELDS))
+        with self.lock:
+            self.users[user.pk] = cached
+            self.users.move_to_end(user.pk)
+            if len(self.users) > self.max_size:
+                self.users.popitem(last=False)
+        return cached
+
+    def get(self, user_id):
+        return self.get_many([user_id]).get(user_id)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.generation += 1
+            self.users.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.users.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE)
+
+
+def invalidate_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+    transaction.on_commit(lambda: user_cache.invalidate(instance.pk))
+
+
+def connect_signals():
+    post_save.connect(invalidate_user, sender=CustomUser)
+    post_delete.connect(invalidate_user, sender=CustomUser)
@@ -1,15 +1,22 @@
-from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (filters, mixins, permissions, status, views,
                             viewsets)
 from rest_framework.decorators import action
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.v1.filters import TitleFilter
+from api.v1.authentication import token_for_user
+from api.v1.autocomplete import INDEXES as AUTOCOMPLETE_INDEXES
+from api.v1.filters import (TITLE_FACETS, FullTextSearchFilter, TitleFilter,
+                            TitleOrderingFilter, title_facets)
+from api.v1.metrics import registry
+from api.v1.mixins import (ConditionalListMixin, ConditionalRetrieveMixin,
+                           CursorPaginationMixin, FacetedListMixin)
+from api.v1.pagination import PubDateCursorPagination, TitleCursorPagination
 from api.v1.permissions import (IsAdminOrReadOnly, ListOrAdminModeratorOnly,
                                 ReadOnlyOrIsAdminOrModeratorOrAuthor)
 from api.v1.serializers import (CategorySerializer, CommentSerializer,
@@ -17,67 +24,143 @@ from api.v1.serializers import (CategorySerializer, CommentSerializer,
                                 SignupSerializer, TitleCreateSerializer,
                                 TitleSerializer, TokenSerializer,
                                 UserSerializer)
+from api.v1.throttling import SignupThrottle, TokenThrottle, WriteThrottle
+from reviews.confirmation import (CODE_INVALID, CODE_VALID, check_code,
+                                  issue_code)
+from reviews.dataset import EXPORT_CONTENT_TYPES, EXPORTERS, FILE_MODEL
 from reviews.models import Category, CustomUser, Genre, Review, Title
 
 
-def get_confirmation_code(user):
-    token = default_token_generator.make_token(user)
-    send_mail(
-        subject='Ваш код для получения api-токена.',
-        message=f'Код: {token}',
-        from_email='test@gmail.com',
-        recipient_list=[user.email],
-        fail_silently=False)
-
-
 class APISignup(views.APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [SignupThrottle]
 
     def post(self, request):
         serializer = SignupSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         username = serializer.validated_data['username']
         email = serializer.validated_data['email']
-        user = CustomUser.objects.create(username=username, email=email)
-        get_confirmation_code(user)
+        with transaction.atomic():
+            user = CustomUser.objects.create(username=username, email=email)
+            issue_code(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class CreateToken(views.APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [TokenThrottle]
 
     def post(self, request):
         serializer = TokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         confirmation_code = serializer.validated_data['confirmation_code']
         username = serializer.validated_data['username']
-        user = get_object_or_404(CustomUser, username=username)
-        if default_token_generator.check_token(user, confirmation_code):
-            token = AccessToken.for_user(user)
+        user = get_object_or_404(
+            CustomUser.objects.select_related('confirmation_code'),
+            username=username)
+        result = check_code(user, confirmation_code)
+        if result == CODE_VALID:
+            token = token_for_user(user)
             return Response({'token': f'{token}'}, status=status.HTTP_200_OK)
-        get_confirmation_code(user)
-        return Response('Неверно введённый код. '
+        if result == CODE_INVALID:
+            return Response('Неверно введённый код',
+                            status=status.HTTP_400_BAD_REQUEST)
+        if issue_code(user) is None:
+            return Response('Код недействителен. Новый код можно запросить '
+                            'не чаще одного раза в '
+                            f'{settings.CONFIRMATION_CODE_RESEND_COOLDOWN} с',
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response('Код недействителен. '
                         'Новый код отправлен вам на почту',
                         status=status.HTTP_400_BAD_REQUEST)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class DataExport(views.APIView):
+    permission_classes = [IsAdminOrReadOnly]
+
+    def get(self, request, file_name):
+        if file_name not in FILE_MODEL:
+            raise Http404
+        export_format = request.query_params.get('type', 'csv')
+        if export_format not in EXPORTERS:
+            return Response(f'Доступные форматы: {", ".join(EXPORTERS)}',
+                            status=status.HTTP_400_BAD_REQUEST)
+        response = StreamingHttpResponse(
+            EXPORTERS[export_format](file_name),
+            content_type=EXPORT_CONTENT_TYPES[export_format])
+        response['Content-Disposition'] = (
+            f'attachment; filename="{file_name}.{export_format}"')
+        return response
+
+
+class Autocomplete(views.APIView):
+    permission_classes = [permissions.AllowAny]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        index_name = request.query_params.get('type', 'titles')
+        if index_name not in AUTOCOMPLETE_INDEXES:
+            return Response(
+                f'Доступные типы: {", ".join(AUTOCOMPLETE_INDEXES)}',
+                status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get(
+                'limit', self.default_limit)), self.max_limit)
+        except ValueError:
+            limit = self.default_limit
+        prefix = request.query_params.get('q', '').strip()
+        if not prefix or limit < 1:
+            return Response({'results': []})
+        return Response({'results': AUTOCOMPLETE_INDEXES[index_name].lookup(
+            prefix, limit)})
+
+
+class Metrics(views.APIView):
+    permission_classes = [IsAdminOrReadOnly]
+
+    def get(self, request):
+        return HttpResponse(registry.render(),
+                            content_type='text/plain; version=0.0.4')
+
+
+class ReviewViewSet(ConditionalListMixin, ConditionalRetrieveMixin,
+                    CursorPaginationMixin, viewsets.ModelViewSet):
+    cache_collection = 'reviews:{title_id}'
+    filter_backends = [FullTextSearchFilter]
+    throttle_classes = [WriteThrottle]
     permission_classes = [ReadOnlyOrIsAdminOrModeratorOrAuthor]
     serializer_class = ReviewSerializer
+    cursor_pagination_class = PubDateCursorPagination
 
     def check_title(self):
         return get_object_or_404(Title, id=self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        return Review.objects.filter(title=self.check_title())
+        return Review.objects.filter(
+            title=self.check_title()).select_related('author')
 
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.check_title())
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalListMixin, ConditionalRetrieveMixin,
+                     CursorPaginationMixin, viewsets.ModelViewSet):
+    cache_collection = 'comments:{review_id}'
+    filter_backends = [FullTextSearchFilter]
+    throttle_classes = [WriteThrottle]
     serializer_class = CommentSerializer
     permission_classes = [ReadOnlyOrIsAdminOrModeratorOrAuthor]
+    cursor_pagination_class = PubDateCursorPagination
 
     def get_review(self):
         title_id = self.kwargs.get('title_id')
@@ -88,7 +171,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save(author=self.request.user, review=self.get_review())
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
 
 
 class CreateListDestroyViewSet(mixins.CreateModelMixin,
@@ -98,7 +181,9 @@ class CreateListDestroyViewSet(mixins.CreateModelMixin,
     pass
 
 
-class GenreViewSet(CreateListDestroyViewSet):
+class GenreViewSet(ConditionalListMixin, CreateListDestroyViewSet):
+    cache_collection = 'genres'
+    cache_responses = True
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = [ListOrAdminModeratorOnly]
@@ -107,7 +192,9 @@ class GenreViewSet(CreateListDestroyViewSet):
     lookup_field = 'slug'
 
 
-class CategoryViewSet(CreateListDestroyViewSet):
+class CategoryViewSet(ConditionalListMixin, CreateListDestroyViewSet):
+    cache_collection = 'categories'
+    cache_responses = True
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [ListOrAdminModeratorOnly]
@@ -116,13 +203,22 @@ class CategoryViewSet(CreateListDestroyViewSet):
     lookup_field = 'slug'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')).order_by('category')
+class TitleViewSet(ConditionalListMixin, ConditionalRetrieveMixin,
+                   FacetedListMixin, CursorPaginationMixin,
+                   viewsets.ModelViewSet):
+    cache_collection = 'titles'
+    cache_responses = True
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre').order_by('category', 'id')
     serializer_class = TitleSerializer
     permission_classes = [ListOrAdminModeratorOnly]
     pagination_class = LimitOffsetPagination
+    cursor_pagination_class = TitleCursorPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter,
+                       TitleOrderingFilter]
     filter_class = filterset_class = TitleFilter
+    facets = tuple(TITLE_FACETS)
+    facet_function = staticmethod(title_facets)
 
     def get_serializer_class(self):
         if self.request.method in ('POST', 'PATCH',):
@@ -140,12 +236,13 @@ class CustomUserViewSet(viewsets.ModelViewSet):
             methods=['get', 'patch'],
             detail=False)
     def me(self, request):
+        user = get_object_or_404(CustomUser, pk=request.user.pk)
         if request.method == 'GET':
-            return Response(self.get_serializer(request.user).data,
+            return Response(self.get_serializer(user).data,
                             status.HTTP_200_OK)
-        serializer = self.get_serializer(request.user,
+        serializer = self.get_serializer(user,
                                          data=request.data,
                                          partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save(role=request.user.role, partial=True)
+        serializer.save(role=user.role, partial=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
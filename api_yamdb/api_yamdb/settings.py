@@ -30,6 +30,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.v1.metrics.MetricsMiddleware',
+    'api.v1.profiling.ProfilerMiddleware',
+    'api.v1.slow_queries.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,12 +74,20 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_FILTER_BACKENDS': [
-        'django_filters.rest_framework.DjangoFilterBackend', ]
+        'django_filters.rest_framework.DjangoFilterBackend', ],
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '20/hour',
+        'token': '30/minute',
+        'write': '60/minute',
+    },
+    # Number of trusted reverse proxies in front of the app; with 0 the
+    # client-supplied X-Forwarded-For is ignored when keying throttles.
+    'NUM_PROXIES': 0,
 }
 
 # Database
@@ -89,6 +100,29 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Collection generations and token versions must be seen by every
+    # worker, so they live in a store shared by all processes on the
+    # host (point this alias at memcached or redis for several hosts).
+    'versions': {
+        'BACKEND': 'api.v1.sqlite_cache.SQLiteCache',
+        'LOCATION': os.path.join(BASE_DIR, 'versions.sqlite3'),
+    },
+}
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -129,9 +163,31 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static/'),)
 AUTH_USER_MODEL = 'reviews.CustomUser'
 
 
+PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+
+SLOW_QUERY_THRESHOLD = 0.1
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'logs', 'slow_queries.log')
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUP_COUNT = 5
+
+AUTOCOMPLETE_MAX_ENTRIES = 100000
+AUTOCOMPLETE_REBUILD_INTERVAL = 60 * 60
+
+USER_CACHE_SIZE = 10000
+
+CONFIRMATION_CODE_BYTES = 12
+CONFIRMATION_CODE_TTL = 60 * 60
+CONFIRMATION_CODE_MAX_ATTEMPTS = 5
+CONFIRMATION_CODE_RESEND_COOLDOWN = 60
+
+THROTTLE_MAX_KEYS = 100000
+THROTTLE_CACHE = None
+
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 EMAIL_HOST = 'smtp.email-domain.com'
 EMAIL_HOST_USER = 'test@gmail.com'
+DEFAULT_FROM_EMAIL = 'test@gmail.com'
 EMAIL_HOST_PASSWORD = '123'
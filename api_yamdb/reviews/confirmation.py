@@ -0,0 +1,66 @@
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from reviews.models import ConfirmationCode
+from reviews.outbox import enqueue_mail
+
+CODE_VALID = 'valid'
+CODE_INVALID = 'invalid'
+CODE_EXPIRED = 'expired'
+CODE_LOCKED = 'locked'
+CODE_MISSING = 'missing'
+
+
+def hash_code(code):
+    return salted_hmac('reviews.confirmation', str(code)).hexdigest()
+
+
+def get_code(user):
+    try:
+        return user.confirmation_code
+    except ConfirmationCode.DoesNotExist:
+        return None
+
+
+def issue_code(user):
+    now = timezone.now()
+    current = get_code(user)
+    cooldown = timedelta(seconds=settings.CONFIRMATION_CODE_RESEND_COOLDOWN)
+    if current is not None and current.created + cooldown > now:
+        return None
+    code = secrets.token_urlsafe(settings.CONFIRMATION_CODE_BYTES)
+    user.confirmation_code, _ = ConfirmationCode.objects.update_or_create(
+        user=user,
+        defaults={
+            'code_hash': hash_code(code),
+            'created': now,
+            'expires': now + timedelta(
+                seconds=settings.CONFIRMATION_CODE_TTL),
+            'attempts': 0,
+        })
+    enqueue_mail(
+        subject='Ваш код для получения api-токена.',
+        message=f'Код: {code}',
+        recipient=user.email)
+    return code
+
+
+def check_code(user, code):
+    current = get_code(user)
+    if current is None:
+        return CODE_MISSING
+    if current.attempts >= settings.CONFIRMATION_CODE_MAX_ATTEMPTS:
+        return CODE_LOCKED
+    if current.expires <= timezone.now():
+        return CODE_EXPIRED
+    if not constant_time_compare(current.code_hash, hash_code(code)):
+        ConfirmationCode.objects.filter(pk=current.pk).update(
+            attempts=F('attempts') + 1)
+        return CODE_INVALID
+    current.delete()
+    return CODE_VALID
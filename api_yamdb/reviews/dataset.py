@@ -0,0 +1,77 @@
+import csv
+import json
+from datetime import datetime
+
+from reviews.models import Category, Comment, CustomUser, Genre, Review, Title
+
+FILE_MODEL = {
+    'category': Category,
+    'genre': Genre,
+    'titles': Title,
+    'users': CustomUser,
+    'review': Review,
+    'comments': Comment,
+    'genre_title': Title.genre.through,
+}
+
+FILE_FOREIGN_KEYS = {
+    'titles': {'category': 'category_id'},
+    'review': {'author': 'author_id'},
+    'comments': {'author': 'author_id'},
+}
+
+FILE_FIELDS = {
+    'category': ('id', 'name', 'slug'),
+    'genre': ('id', 'name', 'slug'),
+    'titles': ('id', 'name', 'year', 'category', 'description'),
+    'users': ('id', 'username', 'email', 'role', 'bio', 'first_name',
+              'last_name'),
+    'review': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments': ('id', 'review_id', 'text', 'author', 'pub_date'),
+    'genre_title': ('id', 'title_id', 'genre_id'),
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def to_text(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_rows(file_name, chunk_size=2000):
+    foreign_keys = FILE_FOREIGN_KEYS.get(file_name, {})
+    fields = [foreign_keys.get(name, name) for name in FILE_FIELDS[file_name]]
+    queryset = FILE_MODEL[file_name].objects.order_by('pk').values_list(
+        *fields)
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield [to_text(value) for value in row]
+
+
+def export_csv(file_name, chunk_size=2000):
+    writer = csv.writer(Echo())
+    yield writer.writerow(FILE_FIELDS[file_name])
+    for row in export_rows(file_name, chunk_size):
+        yield writer.writerow(['' if value is None else value
+                               for value in row])
+
+
+def export_ndjson(file_name, chunk_size=2000):
+    fields = FILE_FIELDS[file_name]
+    for row in export_rows(file_name, chunk_size):
+        yield json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n'
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'ndjson': export_ndjson,
+}
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
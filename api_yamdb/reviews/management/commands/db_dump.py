@@ -0,0 +1,48 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from reviews.dataset import EXPORTERS, FILE_MODEL
+
+
+class Command(BaseCommand):
+    help = 'Команда для выгрузки данных из БД в .csv или .ndjson файлы.' \
+           'Выгрузка выполняется командой python manage.py db_dump'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            required=True,
+            help='Папка для выгружаемых файлов')
+        parser.add_argument(
+            '--format',
+            choices=EXPORTERS,
+            default='csv',
+            help='Формат файлов')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Количество строк, читаемых из БД за раз')
+        parser.add_argument(
+            'files',
+            nargs='*',
+            help='Выгружаемые таблицы, по умолчанию все')
+
+    def handle(self, *args, **options):
+        unknown = set(options['files']) - set(FILE_MODEL)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные таблицы: {", ".join(sorted(unknown))}')
+        os.makedirs(options['path'], exist_ok=True)
+        export = EXPORTERS[options['format']]
+        for file_name in options['files'] or FILE_MODEL:
+            started = time.monotonic()
+            path = os.path.join(options['path'],
+                                f'{file_name}.{options["format"]}')
+            with open(path, 'w', newline='', encoding='utf-8') as dump_file:
+                dump_file.writelines(
+                    export(file_name, options['chunk_size']))
+            print(f'{os.path.basename(path)} '
+                  f'за {time.monotonic() - started:.2f} с')
+        print('Выгрузка данных произведена успешно')
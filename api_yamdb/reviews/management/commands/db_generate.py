@@ -0,0 +1,213 @@
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from reviews.models import (Category, Comment, CustomUser, Genre, Review,
+                            Title, UserRole)
+
+WORDS = (
+    'тайна ночь город море война любовь дорога дом звезда время '
+    'тень огонь песня зима лето ветер сердце мечта путь остров '
+    'король река небо память сон свет голос берег поле край'
+).split()
+SCORE_WEIGHTS = (1, 1, 2, 3, 5, 8, 13, 18, 16, 11)
+POPULARITY_SKEW = 1.1
+COMMENT_SKEW = 3
+START_DATE = datetime(2010, 1, 1)
+POOL_SIZE = 2 ** 16
+
+
+def zipf_weights(count, skew=POPULARITY_SKEW):
+    return [1 / rank ** skew for rank in range(1, count + 1)]
+
+
+def split_skewed(total, count, limit):
+    if not count or not total:
+        return [0] * count
+    weights = zipf_weights(count)
+    scale = total / sum(weights)
+    sizes = [min(int(weight * scale), limit) for weight in weights]
+    missing = total - sum(sizes)
+    index = 0
+    while missing > 0 and index < count * limit:
+        if sizes[index % count] < limit:
+            sizes[index % count] += 1
+            missing -= 1
+        index += 1
+    return sizes
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = 'Команда для генерации тестовых данных заданного размера.' \
+           'Генерация выполняется командой python manage.py db_generate'
+
+    def add_arguments(self, parser):
+        for name, default in (('categories', 10), ('genres', 30),
+                              ('users', 1000), ('titles', 1000),
+                              ('reviews', 10000), ('comments', 10000)):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Количество записей {name}')
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Начальное значение генератора случайных чисел')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Количество строк в одной вставке')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.dates = [self.date() for _ in range(POOL_SIZE)]
+        self.texts = {words: [self.text(words) for _ in range(POOL_SIZE)]
+                      for words in (10, 20)}
+        self.ids = {model: next_id(model) for model in (
+            Category, Genre, CustomUser, Title, Review, Comment)}
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous = OFF')
+        started = time.monotonic()
+        self.insert(Category, ('id', 'name', 'slug'),
+                    self.categories(options['categories']))
+        self.insert(Genre, ('id', 'name', 'slug'),
+                    self.genres(options['genres']))
+        self.insert(CustomUser, (
+            'id', 'username', 'email', 'role', 'password', 'is_superuser',
+            'is_staff', 'is_active', 'date_joined', 'first_name',
+            'last_name', 'bio', 'token_version'),
+            self.users(options['users']))
+        self.insert(Title, (
+            'id', 'name', 'year', 'category', 'description', 'rating_sum',
+            'rating_count'), self.titles(options))
+        self.insert(Title.genre.through, ('title', 'genre'),
+                    self.title_genres(options))
+        self.insert(Review, (
+            'id', 'title', 'text', 'author', 'score', 'pub_date'),
+            self.reviews(options))
+        self.insert(Comment, ('id', 'review', 'text', 'author', 'pub_date'),
+                    self.comments(options))
+        rating_started = time.monotonic()
+        Title.objects.rebuild_rating()
+        print(f'Рейтинг пересчитан '
+              f'за {time.monotonic() - rating_started:.2f} с')
+        print(f'Генерация данных произведена успешно '
+              f'за {time.monotonic() - started:.2f} с')
+
+    def insert(self, model, fields, rows):
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(model._meta.get_field(field).column)
+                            for field in fields)
+        sql = (f'INSERT INTO {quote(model._meta.db_table)} ({columns}) '
+               f'VALUES ({", ".join(["%s"] * len(fields))})')
+        started = time.monotonic()
+        count = 0
+        batch = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            for row in rows:
+                batch.append(row)
+                if len(batch) == self.batch_size:
+                    cursor.executemany(sql, batch)
+                    count += len(batch)
+                    batch = []
+            cursor.executemany(sql, batch)
+            count += len(batch)
+        elapsed = time.monotonic() - started
+        print(f'{model._meta.db_table}: {count} строк за {elapsed:.2f} с '
+              f'({count / max(elapsed, 1e-6):.0f} строк/с)')
+
+    def text(self, words):
+        return ' '.join(self.random.choices(WORDS, k=words)).capitalize()
+
+    def date(self):
+        seconds = (self.now.replace(tzinfo=None) - START_DATE).total_seconds()
+        value = START_DATE + timedelta(seconds=self.random.random() * seconds)
+        return connection.ops.adapt_datetimefield_value(
+            timezone.make_aware(value, timezone.utc))
+
+    def categories(self, count):
+        first = self.ids[Category]
+        for pk in range(first, first + count):
+            yield pk, f'Категория {pk}', f'category-{pk}'
+
+    def genres(self, count):
+        first = self.ids[Genre]
+        for pk in range(first, first + count):
+            yield pk, f'Жанр {pk}', f'genre-{pk}'
+
+    def users(self, count):
+        first = self.ids[CustomUser]
+        roles = [role.value for role in UserRole]
+        joined = connection.ops.adapt_datetimefield_value(self.now)
+        for pk in range(first, first + count):
+            role = self.random.choices(roles, (985, 12, 3))[0]
+            yield (pk, f'user{pk}', f'user{pk}@yamdb.fake', role, '',
+                   False, False, True, joined, '', '', '', 0)
+
+    def titles(self, options):
+        first = self.ids[Title]
+        categories = range(self.ids[Category],
+                           self.ids[Category] + options['categories'])
+        category_weights = list(accumulate(zipf_weights(len(categories))))
+        for pk in range(first, first + options['titles']):
+            category = None
+            if categories:
+                category = self.random.choices(
+                    categories, cum_weights=category_weights)[0]
+            yield (pk, self.text(self.random.randint(1, 4)),
+                   self.random.randint(1900, self.now.year), category,
+                   self.text(12), 0, 0)
+
+    def title_genres(self, options):
+        genres = range(self.ids[Genre], self.ids[Genre] + options['genres'])
+        for pk in range(self.ids[Title], self.ids[Title] + options['titles']):
+            for genre in self.random.sample(
+                    genres, min(self.random.randint(1, 3), len(genres))):
+                yield pk, genre
+
+    def reviews(self, options):
+        pk = self.ids[Review]
+        first_user = self.ids[CustomUser]
+        users = options['users']
+        score_weights = list(accumulate(SCORE_WEIGHTS))
+        sizes = split_skewed(options['reviews'], options['titles'], users)
+        for title, size in enumerate(sizes, self.ids[Title]):
+            if not size:
+                continue
+            offset = self.random.randrange(users)
+            scores = self.random.choices(
+                range(1, 11), cum_weights=score_weights, k=size)
+            for index, score in enumerate(scores):
+                author = first_user + (offset + index) % users
+                yield (pk, title, self.random.choice(self.texts[20]),
+                       author, score, self.random.choice(self.dates))
+                pk += 1
+        self.reviews_created = pk - self.ids[Review]
+
+    def comments(self, options):
+        first_review = self.ids[Review]
+        first_user = self.ids[CustomUser]
+        if not self.reviews_created or not options['users']:
+            return
+        for pk in range(self.ids[Comment],
+                        self.ids[Comment] + options['comments']):
+            review = first_review + int(
+                self.reviews_created * self.random.random() ** COMMENT_SKEW)
+            author = first_user + self.random.randrange(options['users'])
+            yield (pk, review, self.random.choice(self.texts[10]), author,
+                   self.random.choice(self.dates))
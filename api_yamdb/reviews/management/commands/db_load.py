@@ -1,49 +1,196 @@
-import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from contextlib import contextmanager
 
-from django.core.management.base import BaseCommand
-from reviews.models import (Category, Comment, CustomUser, Genre, Review,
-                            Title, TitleGenre)
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from reviews.dataset import FILE_FOREIGN_KEYS, FILE_MODEL
+from reviews.management.csv_reader import (parse_into_queue, parse_messages,
+                                           read_queue)
+from reviews.models import Title
 
-FILE_MODEL = {
-    'category': Category,
-    'genre': Genre,
-    'titles': Title,
-    'users': CustomUser,
-    'review': Review,
-    'comments': Comment,
-    'genre_title': TitleGenre,
-}
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+CHECKPOINT_FILE = '.db_load_checkpoint.json'
+REPORT_INTERVAL = 5
+QUEUE_SIZE = 8
+
+LOAD_LEVELS = (
+    ('category', 'genre', 'users'),
+    ('titles',),
+    ('review', 'genre_title'),
+    ('comments',),
+)
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def read_checkpoint(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as checkpoint_file:
+        return json.load(checkpoint_file)
+
+
+def write_checkpoint(path, checkpoint):
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(f'{path}.tmp', path)
+
+
+def skip_existing(model, objects):
+    to_python = model._meta.pk.to_python
+    existing = set(model.objects.filter(
+        pk__in=[obj.pk for obj in objects]).values_list('pk', flat=True))
+    if not existing:
+        return objects, 0
+    return ([obj for obj in objects if to_python(obj.pk) not in existing],
+            len(existing))
+
+
+def memory_usage():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return usage / 1024 ** 2
+    return usage / 1024
 
 
 class Command(BaseCommand):
     help = 'Команда для импорта данных из .csv файла в БД.' \
            'Импорт выполняется командой python manage.py db_load'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DATA_DIR,
+            help='Папка с .csv файлами')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одной вставке')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Количество процессов для разбора .csv файлов')
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить прерванный импорт с последней '
+                 'сохранённой пачки')
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл с прогрессом импорта '
+                 '(по умолчанию в папке с .csv файлами)')
+
     def handle(self, *args, **options):
-        for file_name, model in FILE_MODEL.items():
-            with open(
-                    f'static/data/{file_name}.csv',
-                    newline='',
-                    encoding='utf-8'
-            ) as csv_file:
-                datareader = csv.DictReader(csv_file, delimiter=',')
-                if file_name == 'titles':
-                    for row in datareader:
-                        category = Category.objects.get(pk=row.pop('category'))
-                        obj = model(
-                            category=category,
-                            **row
-                        )
-                        obj.save()
-                elif file_name in ['review', 'comments']:
-                    for row in datareader:
-                        user = CustomUser.objects.get(pk=row.pop('author'))
-                        obj = model(
-                            author=user,
-                            **row
-                        )
-                        obj.save()
-                else:
-                    model.objects.bulk_create(
-                        [model(**row) for row in datareader])
-        print('Импорт данных произведён успешно')
+        self.checkpoint_path = options['checkpoint'] or os.path.join(
+            options['path'], CHECKPOINT_FILE)
+        self.checkpoint = {}
+        if options['resume']:
+            self.checkpoint = read_checkpoint(self.checkpoint_path)
+        started = time.monotonic()
+        tasks = {
+            file_name: (
+                os.path.join(options['path'], f'{file_name}.csv'),
+                FILE_FOREIGN_KEYS.get(file_name, {}),
+                options['batch_size'],
+                self.checkpoint.get(f'{file_name}.csv', 0))
+            for level in LOAD_LEVELS for file_name in level}
+        workers = min(options['workers'], len(tasks))
+        if workers > 1:
+            with multiprocessing.Manager() as manager, \
+                    multiprocessing.Pool(workers) as pool:
+                sources = {}
+                for file_name, task in tasks.items():
+                    queue = manager.Queue(QUEUE_SIZE)
+                    pool.apply_async(parse_into_queue, (queue, *task))
+                    sources[file_name] = read_queue(queue)
+                self.load_levels(sources)
+        else:
+            self.load_levels({file_name: parse_messages(*task)
+                              for file_name, task in tasks.items()})
+        Title.objects.rebuild_rating()
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        print(f'Импорт данных произведён успешно '
+              f'за {time.monotonic() - started:.2f} с')
+
+    def load_levels(self, sources):
+        for number, level in enumerate(LOAD_LEVELS):
+            started = time.monotonic()
+            for file_name in level:
+                model = FILE_MODEL[file_name]
+                with keep_auto_now_add(model):
+                    self.load_file(f'{file_name}.csv', model,
+                                   sources[file_name])
+            print(f'Уровень {number}: {", ".join(level)} '
+                  f'за {time.monotonic() - started:.2f} с')
+
+    def load_file(self, name, model, messages):
+        started = reported = time.monotonic()
+        rows = done = self.checkpoint.get(name, 0)
+        write_time = 0
+        skipped = 0
+        has_rows = model.objects.exists()
+        for kind, payload in messages:
+            if kind == 'error':
+                raise CommandError(f'Ошибка разбора {name}: {payload}')
+            if kind == 'done':
+                parse_time = payload
+                break
+            write_started = time.monotonic()
+            objects = [model(**row) for row in payload]
+            if has_rows:
+                objects, found = skip_existing(model, objects)
+                skipped += found
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create(objects)
+            except IntegrityError as error:
+                raise CommandError(
+                    f'Ошибка записи {name}, строки {rows + 1}-'
+                    f'{rows + len(payload)}: {error}')
+            write_time += time.monotonic() - write_started
+            rows += len(payload)
+            self.checkpoint[name] = rows
+            write_checkpoint(self.checkpoint_path, self.checkpoint)
+            if time.monotonic() - reported >= REPORT_INTERVAL:
+                reported = time.monotonic()
+                print(f'{name}: {rows - done} строк ...')
+        self.report(name, rows - done, skipped, started, parse_time,
+                    write_time)
+
+    def report(self, name, rows, skipped, started, parse_time, write_time):
+        elapsed = time.monotonic() - started
+        message = (f'{name}: {rows} строк за {elapsed:.2f} с '
+                   f'({rows / max(elapsed, 1e-6):.0f} строк/с), '
+                   f'разбор {parse_time:.2f} с, запись {write_time:.2f} с')
+        if skipped:
+            message += f', пропущено уже загруженных {skipped}'
+        memory = memory_usage()
+        if memory is not None:
+            message += f', пиковая память {memory:.1f} МБ'
+        print(message)
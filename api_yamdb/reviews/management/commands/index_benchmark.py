@@ -0,0 +1,98 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+from reviews.models import Comment, Review, Title
+
+INDEXED_MODELS = (Title, Review, Comment)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Команда для сравнения планов и скорости запросов API ' \
+           'с индексами и без них. Выполняется командой ' \
+           'python manage.py index_benchmark'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Количество повторов каждого запроса')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Сравнение планов поддерживается для SQLite')
+        queries = self.get_queries()
+        with_indexes = self.measure(queries, options['repeat'], 'indexed')
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for model in INDEXED_MODELS:
+                        for index in model._meta.indexes:
+                            cursor.execute(f'DROP INDEX "{index.name}"')
+                without_indexes = self.measure(
+                    queries, options['repeat'], 'plain')
+                raise Rollback
+        except Rollback:
+            pass
+        for name in queries:
+            before, after = without_indexes[name], with_indexes[name]
+            print(f'{name}: {before["ms"]:.3f} мс -> {after["ms"]:.3f} мс')
+            print('   без индексов: ' + ' | '.join(before['plan']))
+            print('   с индексами:  ' + ' | '.join(after['plan']))
+
+    def get_queries(self):
+        title = Title.objects.order_by('-rating_count').first()
+        if title is None:
+            raise CommandError('БД пуста, сначала выполните db_generate')
+        review = Review.objects.filter(title=title).annotate(
+            comment_count=Count('comments')).order_by(
+            '-comment_count').first()
+        middle = Comment.objects.filter(review=review).order_by(
+            '-pub_date')[50:51].first()
+        category = title.category
+        return {
+            'comments-list': Comment.objects.filter(
+                review=review).order_by('-pub_date')[:100],
+            'comments-cursor': Comment.objects.filter(
+                review=review,
+                pub_date__lt=middle.pub_date if middle else timezone.now(),
+            ).order_by('-pub_date', '-id')[:100],
+            'reviews-cursor': Review.objects.filter(
+                title=title).order_by('-pub_date', '-id')[:100],
+            'titles-list': Title.objects.order_by('category', 'id')[
+                1000:1100],
+            'titles-year': Title.objects.filter(year=title.year).order_by(
+                'category', 'id')[:100],
+            'titles-category': Title.objects.filter(
+                category__slug=category.slug if category else '').order_by(
+                'category', 'id')[:100],
+        }
+
+    def measure(self, queries, repeat, label):
+        results = {}
+        with connection.cursor() as cursor:
+            for name, queryset in queries.items():
+                sql, params = queryset.query.sql_with_params()
+                # sqlite3 кэширует подготовленные EXPLAIN, и после
+                # DROP INDEX они возвращают старый план.
+                sql = f'/* {label} */ {sql}'
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = [row[-1] for row in cursor.fetchall()]
+                cursor.execute(sql, params)
+                cursor.fetchall()
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                results[name] = {
+                    'ms': (time.perf_counter() - started) * 1000 / repeat,
+                    'plan': plan,
+                }
+        return results
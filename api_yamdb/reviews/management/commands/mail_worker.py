@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import OutboxWorker
+
+
+class Command(BaseCommand):
+    help = 'Команда для отправки писем из очереди исходящей почты.' \
+           'Отправка выполняется командой python manage.py mail_worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Количество писем, выбираемых из очереди за раз')
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='Количество попыток отправки одного письма')
+        parser.add_argument(
+            '--backoff',
+            type=float,
+            default=60,
+            help='Задержка перед первой повторной попыткой в секундах, '
+                 'удваивается с каждой попыткой')
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками очереди в секундах')
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить накопившиеся письма и завершить работу')
+
+    def handle(self, *args, **options):
+        worker = OutboxWorker(
+            batch_size=options['batch_size'],
+            max_attempts=options['max_attempts'],
+            backoff=options['backoff'])
+        while True:
+            sent, failed = worker.drain()
+            if sent or failed:
+                print(f'Отправлено писем: {sent}, с ошибкой: {failed}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
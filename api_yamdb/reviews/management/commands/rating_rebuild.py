@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Команда для пересчёта рейтинга произведений по отзывам.' \
+           'Пересчёт выполняется командой python manage.py rating_rebuild'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = Title.objects.rebuild_rating()
+        print(f'Рейтинг пересчитан для {count} произведений')
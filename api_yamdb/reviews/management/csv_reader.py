@@ -0,0 +1,48 @@
+import csv
+import time
+from itertools import islice
+
+
+def read_batches(path, foreign_keys, batch_size, skip=0):
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        datareader = csv.DictReader(csv_file, delimiter=',')
+        datareader.fieldnames = [foreign_keys.get(name, name)
+                                 for name in datareader.fieldnames]
+        rows = islice(datareader, skip, None)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            for row in batch:
+                for field in foreign_keys.values():
+                    row[field] = row[field] or None
+            yield batch
+
+
+def parse_messages(path, foreign_keys, batch_size, skip=0):
+    parse_time = 0
+    batches = read_batches(path, foreign_keys, batch_size, skip)
+    while True:
+        started = time.monotonic()
+        batch = next(batches, None)
+        parse_time += time.monotonic() - started
+        if batch is None:
+            break
+        yield 'batch', batch
+    yield 'done', parse_time
+
+
+def parse_into_queue(queue, *args):
+    try:
+        for message in parse_messages(*args):
+            queue.put(message)
+    except Exception as error:
+        queue.put(('error', f'{error.__class__.__name__}: {error}'))
+
+
+def read_queue(queue):
+    while True:
+        kind, payload = queue.get()
+        yield kind, payload
+        if kind != 'batch':
+            return
@@ -0,0 +1,65 @@
+from django.db import migrations
+
+FTS_TABLES = {
+    'reviews_title': ('name', 'description'),
+    'reviews_review': ('text',),
+    'reviews_comment': ('text',),
+}
+FTS_RANK = {
+    'reviews_title': 'bm25(10.0, 1.0)',
+}
+
+
+def create_fts_sql(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete = (f"INSERT INTO {fts}({fts}, rowid, {names}) "
+              f"VALUES ('delete', old.id, {old});")
+    insert = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});'
+    statements = [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert} END',
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete} END',
+        f'CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table} '
+        f'BEGIN {delete} {insert} END',
+    ]
+    if table in FTS_RANK:
+        statements.append(f"INSERT INTO {fts}({fts}, rank) "
+                          f"VALUES ('rank', '{FTS_RANK[table]}')")
+    return statements
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, columns in FTS_TABLES.items():
+        for statement in create_fts_sql(table, columns):
+            schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in FTS_TABLES:
+        for trigger in ('insert', 'delete', 'update'):
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS {table}_fts_{trigger}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -4,6 +4,8 @@ from django.contrib.auth.models import AbstractUser
 from django.core.validators import (MaxValueValidator, MinValueValidator,
                                     RegexValidator)
 from django.db import models
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
 
 from reviews.validators import validate_year
 
@@ -42,6 +44,12 @@ class CustomUser(AbstractUser):
         max_length=20,
         choices=UserRole.get_all_roles(),
         default=UserRole.USER.value)
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False)
+
+    TOKEN_CLAIM_FIELDS = ('username', 'role', 'is_staff', 'is_superuser',
+                          'is_active')
 
     class Meta:
         ordering = ('username',)
@@ -49,6 +57,26 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._token_claims = user.token_claims()
+        return user
+
+    def token_claims(self):
+        return tuple(self.__dict__.get(field)
+                     for field in self.TOKEN_CLAIM_FIELDS)
+
+    def save(self, *args, **kwargs):
+        claims = self.token_claims()
+        if getattr(self, '_token_claims', claims) != claims:
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._token_claims = claims
+
     @property
     def is_admin(self):
         return self.role == UserRole.ADMIN.value or self.is_staff
@@ -92,6 +120,28 @@ class Genre(models.Model):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    def shift_rating(self, score, count=0):
+        rating_sum = models.F('rating_sum') + score
+        rating_count = models.F('rating_count') + count
+        return self.update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=(Cast(rating_sum, models.FloatField())
+                    / NullIf(rating_count, 0)))
+
+    def rebuild_rating(self):
+        reviews = Review.objects.filter(
+            title=models.OuterRef('pk')).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(models.Subquery(reviews.annotate(
+                total=models.Sum('score')).values('total')), 0),
+            rating_count=Coalesce(models.Subquery(reviews.annotate(
+                total=models.Count('pk')).values('total')), 0),
+            rating=models.Subquery(reviews.annotate(
+                total=models.Avg('score')).values('total')))
+
+
 class Title(models.Model):
     name = models.CharField(
         'Название',
@@ -115,10 +165,38 @@ class Title(models.Model):
         Genre,
         related_name='titles',
         verbose_name='Жанр')
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False)
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False)
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        editable=False)
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['category', 'id'],
+                         name='title_category_id_idx'),
+            models.Index(fields=['year', 'category'],
+                         name='title_year_category_idx'),
+            models.Index(fields=['rating', 'id'],
+                         name='title_rating_id_idx'),
+            models.Index(fields=['rating_count', 'id'],
+                         name='title_reviews_id_idx'),
+            models.Index(fields=['year', 'id'],
+                         name='title_year_id_idx'),
+            models.Index(fields=['name', 'id'],
+                         name='title_name_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -160,6 +238,10 @@ class Review(pub_date_abstract_model):
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
+        indexes = [
+            models.Index(fields=['title', 'pub_date'],
+                         name='review_title_pub_date_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -182,6 +264,66 @@ class Comment(pub_date_abstract_model):
         ordering = ('-pub_date',)
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=['review', 'pub_date'],
+                         name='comment_review_pub_date_idx'),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class OutgoingMailQuerySet(models.QuerySet):
+    def pending(self, now, max_attempts):
+        return self.filter(
+            sent__isnull=True,
+            attempts__lt=max_attempts,
+            next_attempt__lte=now,
+        ).order_by('next_attempt', 'id')
+
+
+class OutgoingMail(models.Model):
+    subject = models.CharField('Тема', max_length=255)
+    message = models.TextField('Текст письма')
+    from_email = models.CharField('Отправитель', max_length=254)
+    recipient = models.EmailField('Получатель', max_length=254)
+    created = models.DateTimeField('Дата постановки в очередь',
+                                   auto_now_add=True)
+    next_attempt = models.DateTimeField('Следующая попытка',
+                                        default=timezone.now)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    sent = models.DateTimeField('Дата отправки', null=True, blank=True)
+
+    objects = OutgoingMailQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(fields=['sent', 'next_attempt'],
+                         name='outgoing_mail_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class ConfirmationCode(models.Model):
+    user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='confirmation_code')
+    code_hash = models.CharField('Хеш кода', max_length=64)
+    created = models.DateTimeField('Дата выдачи')
+    expires = models.DateTimeField('Действует до')
+    attempts = models.PositiveSmallIntegerField(
+        'Неудачные попытки', default=0)
+
+    class Meta:
+        verbose_name = 'Код подтверждения'
+        verbose_name_plural = 'Коды подтверждения'
+
+    def __str__(self):
+        return f'{self.user_id}: {self.expires}'
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.models import OutgoingMail
+
+
+def enqueue_mail(subject, message, recipient, from_email=None):
+    return OutgoingMail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipient=recipient)
+
+
+def retry_delay(attempts, backoff):
+    return timedelta(seconds=backoff * 2 ** (attempts - 1))
+
+
+class OutboxWorker:
+    def __init__(self, batch_size=100, max_attempts=5, backoff=60):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.connection = None
+
+    def open(self):
+        if self.connection is None:
+            self.connection = get_connection(fail_silently=False)
+        self.connection.open()
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            finally:
+                self.connection = None
+
+    def send(self, mail):
+        try:
+            self.open()
+            EmailMessage(
+                subject=mail.subject,
+                body=mail.message,
+                from_email=mail.from_email,
+                to=[mail.recipient],
+                connection=self.connection,
+            ).send()
+        except Exception as error:
+            self.close()
+            return error
+        return None
+
+    def process_batch(self):
+        now = timezone.now()
+        batch = list(OutgoingMail.objects.pending(
+            now, self.max_attempts)[:self.batch_size])
+        sent_ids = []
+        failed = 0
+        for mail in batch:
+            error = self.send(mail)
+            if error is None:
+                sent_ids.append(mail.pk)
+                continue
+            failed += 1
+            attempts = mail.attempts + 1
+            OutgoingMail.objects.filter(pk=mail.pk).update(
+                attempts=attempts,
+                next_attempt=now + retry_delay(attempts, self.backoff),
+                last_error=f'{type(error).__name__}: {error}')
+        OutgoingMail.objects.filter(pk__in=sent_ids).update(
+            sent=timezone.now(), attempts=F('attempts') + 1, last_error='')
+        return len(sent_ids), failed
+
+    def drain(self):
+        sent = failed = 0
+        try:
+            while True:
+                batch_sent, batch_failed = self.process_batch()
+                sent += batch_sent
+                failed += batch_failed
+                if batch_sent + batch_failed < self.batch_size:
+                    return sent, failed
+        finally:
+            self.close()
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from reviews.models import Review, Title
+
+
+def remember_score(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._old_score = None
+        return
+    instance._old_score = Review.objects.filter(
+        pk=instance.pk).values_list('score', flat=True).first()
+
+
+def add_score(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    titles = Title.objects.filter(pk=instance.title_id)
+    old_score = getattr(instance, '_old_score', None)
+    if created or old_score is None:
+        titles.shift_rating(instance.score, 1)
+    elif instance.score != old_score:
+        titles.shift_rating(instance.score - old_score)
+    instance._old_score = instance.score
+
+
+def remove_score(sender, instance, **kwargs):
+    Title.objects.filter(pk=instance.title_id).shift_rating(
+        -instance.score, -1)
+
+
+def connect_signals():
+    pre_save.connect(remember_score, sender=Review)
+    post_save.connect(add_score, sender=Review)
+    post_delete.connect(remove_score, sender=Review)
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,4 +34,25 @@ assert get_version() < '3.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_queries',
 ]
+
+
+@pytest.fixture(scope='session', autouse=True)
+def versions_store(tmp_path_factory):
+    from django.conf import settings
+    settings.CACHES['versions']['LOCATION'] = str(
+        tmp_path_factory.mktemp('versions') / 'versions.sqlite3')
+
+
+@pytest.fixture(autouse=True)
+def clear_api_cache():
+    from django.core.cache import caches
+    caches['api'].clear()
+    caches['versions'].clear()
+    from api.v1 import autocomplete
+    from api.v1.throttling import memory_buckets
+    from api.v1.user_cache import user_cache
+    autocomplete.reset()
+    user_cache.clear()
+    memory_buckets.clear()
@@ -0,0 +1,43 @@
+import pytest
+
+PAGE_SIZES = (1, 10, 100)
+
+
+class QueryBudget:
+
+    def __init__(self, max_queries):
+        self.max_queries = max_queries
+
+    def check(self, client, url, page_sizes=PAGE_SIZES):
+        from django.core.cache import caches
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from api.v1.user_cache import user_cache
+
+        counts = {}
+        for size in page_sizes:
+            caches['api'].clear()
+            user_cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url, {'limit': size} if size else {})
+            assert response.status_code == 200, (
+                f'Проверьте, что GET запрос `{url}` возвращает статус 200'
+            )
+            queries = '\n'.join(query['sql'] for query in context.captured_queries)
+            assert len(context) <= self.max_queries, (
+                f'GET запрос `{url}` с limit={size} выполняет {len(context)} SQL запросов, '
+                f'допустимо не больше {self.max_queries}:\n{queries}'
+            )
+            counts[size] = len(context)
+        assert len(set(counts.values())) == 1, (
+            f'Количество SQL запросов GET `{url}` растёт с размером страницы: {counts}'
+        )
+
+
+@pytest.fixture
+def query_budget(request):
+    marker = request.node.get_closest_marker('query_budget')
+    if marker is None:
+        pytest.fail('Укажите лимит запросов маркером `@pytest.mark.query_budget(n)`')
+    return QueryBudget(marker.args[0])
@@ -249,3 +249,18 @@ class Test04TitleAPI:
         user, moderator = create_users_api(admin_client)
         self.check_permissions(user, 'обычного пользователя', titles, categories, genres)
         self.check_permissions(moderator, 'модератора', titles, categories, genres)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_titles_queries(self, client, admin_client, django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        for i in range(20):
+            data = {'name': f'Произведение {i}', 'year': 2000, 'genre': [genres[i % 3]['slug']],
+                    'category': categories[i % 2]['slug']}
+            admin_client.post('/api/v1/titles/', data=data)
+        with django_assert_max_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == 22, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращаются все произведения'
+        )
+        with django_assert_max_num_queries(2):
+            client.get(f'/api/v1/titles/{titles[0]["id"]}/')
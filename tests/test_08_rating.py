@@ -0,0 +1,60 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08RatingAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_reviews(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = admin_client.get(url)
+        assert response.json().get('rating') == 4, (
+            'Проверьте, что после создания отзывов `rating` произведения пересчитывается'
+        )
+        client_user = auth_client(user)
+        client_user.patch(
+            f'{url}reviews/{reviews[1]["id"]}/', data={'score': 10}
+        )
+        response = admin_client.get(url)
+        assert response.json().get('rating') == 6, (
+            'Проверьте, что после изменения оценки `rating` произведения пересчитывается'
+        )
+        for review in reviews:
+            admin_client.delete(f'{url}reviews/{review["id"]}/')
+        response = admin_client.get(url)
+        assert response.json().get('rating') is None, (
+            'Проверьте, что после удаления всех отзывов `rating` произведения равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rating_rebuild(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('rating_rebuild')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (12, 3, 4), (
+            'Проверьте, что команда `rating_rebuild` восстанавливает рейтинг произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rating_after_author_deleted(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, moderator = create_reviews(admin_client, admin)
+        response = admin_client.delete(f'/api/v1/users/{moderator.username}/')
+        assert response.status_code == 204, (
+            'Проверьте, что администратор может удалить пользователя'
+        )
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') == 4, (
+            'Проверьте, что после удаления автора отзыва `rating` произведения пересчитывается'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (8, 2), (
+            'Проверьте, что каскадное удаление отзывов обновляет сумму и число оценок'
+        )
@@ -0,0 +1,40 @@
+import pytest
+
+from .common import create_comments, create_titles
+
+
+class Test09CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?pagination=cursor&limit=1')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?pagination=cursor` возвращается статус 200'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при постраничном выводе по курсору не выполняется подсчёт `count`'
+        )
+        assert [title['id'] for title in data['results']] == [titles[0]['id']]
+        response = client.get(data['next'])
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [titles[1]['id']], (
+            'Проверьте, что ссылка `next` при постраничном выводе по курсору ведёт на следующую страницу'
+        )
+        assert data['next'] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_cursor(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        received = []
+        next_url = f'{url}?pagination=cursor&limit=2'
+        while next_url:
+            data = client.get(next_url).json()
+            received.extend(comment['id'] for comment in data['results'])
+            next_url = data['next']
+        assert received == [comment['id'] for comment in reversed(comments)], (
+            'Проверьте, что при постраничном выводе по курсору комментарии '
+            'возвращаются от новых к старым без пропусков и повторов'
+        )
@@ -0,0 +1,125 @@
+import pytest
+
+from .common import auth_client, create_comments, create_reviews, create_titles
+from .conftest import MANAGE_PATH
+
+
+class Test10ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cached(self, client, admin_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == len(titles), (
+            'Проверьте, что повторный GET запрос `/api/v1/titles/` отдаётся из кэша'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == len(titles) - 1, (
+            'Проверьте, что кэш `/api/v1/titles/` сбрасывается при удалении произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rating_invalidates(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] == 4
+        auth_client(user).patch(f'{url}reviews/{reviews[1]["id"]}/', data={'score': 9})
+        assert client.get(url).json()['rating'] == 6, (
+            'Проверьте, что кэш произведения сбрасывается при изменении отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_genres_invalidate(self, client, admin_client):
+        client.get('/api/v1/genres/')
+        admin_client.post('/api/v1/genres/', data={'name': 'Ужасы', 'slug': 'horror'})
+        response = client.get('/api/v1/genres/')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что кэш `/api/v1/genres/` сбрасывается при создании жанра'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_conditional_get(self, client, admin_client, admin, django_assert_num_queries):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET запрос `{url}` содержит заголовки `ETag` и `Last-Modified`'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET запрос `{url}` с актуальным `If-None-Match` возвращает статус 304'
+        )
+        response = client.get(f'{url}{reviews[0]["id"]}/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что `ETag` зависит от адреса запроса'
+        )
+        auth_client(user).patch(f'{url}{reviews[1]["id"]}/', data={'text': 'Новый текст'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f'Проверьте, что после изменения отзыва GET запрос `{url}` возвращает новые данные'
+        )
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == 304, (
+            f'Проверьте, что GET запрос `{url}` с актуальным `If-Modified-Since` возвращает статус 304'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_generations_shared(self, client, admin_client, admin):
+        from django.conf import settings
+
+        from api.v1.sqlite_cache import SQLiteCache
+
+        from api.v1.cache import generation_key, get_version_cache
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = client.get(url).get('ETag')
+        location = settings.CACHES['versions']['LOCATION']
+        assert get_version_cache().location == location and not location.startswith(MANAGE_PATH)
+        other_worker = SQLiteCache(location, {})
+        key = generation_key(f'reviews:{titles[0]["id"]}')
+        other_worker.set(key, other_worker.get(key) + 1, None)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что поколения коллекций хранятся в общем для всех процессов кэше'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_author_rename_invalidates(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        urls = [
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+        ]
+        etags = [client.get(url).get('ETag') for url in urls]
+        response = admin_client.patch(f'/api/v1/users/{user.username}/', data={'username': 'renamed'})
+        assert response.status_code == 200
+        for url, etag in zip(urls, etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200 and 'renamed' in [
+                item['author'] for item in response.json()['results']
+            ], (
+                f'Проверьте, что после переименования автора GET запрос `{url}` возвращает новое имя'
+            )
+
+    def test_07_sqlite_cache(self, tmp_path):
+        from api.v1.sqlite_cache import SQLiteCache
+
+        cache = SQLiteCache(str(tmp_path / 'versions.sqlite3'), {})
+        assert cache.get_or_set('generation:titles', 1, None) == 1
+        assert cache.get_or_set('generation:titles', 2, None) == 1, (
+            'Проверьте, что `get_or_set` не перезаписывает существующее значение'
+        )
+        cache.set_many({f'token_version:{pk}': pk for pk in range(20000)}, None)
+        assert cache.get('token_version:0') == 0 and cache.get('token_version:19999') == 19999, (
+            'Проверьте, что хранилище версий не вытесняет записи'
+        )
+        cache.set('expired', 1, -1)
+        assert cache.get('expired') is None and cache.add('expired', 2) and cache.get('expired') == 2
+        cache.delete('generation:titles')
+        assert cache.get('generation:titles') is None
@@ -0,0 +1,174 @@
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_DIR = f'{MANAGE_PATH}/static/data'
+
+
+class Test11DbLoad:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_db_load(self, client):
+        from reviews.models import Comment, Review, Title
+
+        call_command('db_load', path=DATA_DIR, batch_size=10, workers=1)
+        assert Title.objects.count() == 32, (
+            'Проверьте, что команда `db_load` загружает все произведения'
+        )
+        assert Review.objects.count() == 72 and Comment.objects.count() == 3, (
+            'Проверьте, что команда `db_load` загружает все отзывы и комментарии'
+        )
+        data = client.get('/api/v1/titles/1/').json()
+        assert data['category']['slug'] == 'movie' and data['rating'] == 10, (
+            'Проверьте, что после `db_load` у произведений заполнены категория и рейтинг'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_db_load_genres(self, client):
+        call_command('db_load', path=DATA_DIR)
+        data = client.get('/api/v1/titles/?genre=drama').json()
+        assert data['count'] > 0, (
+            'Проверьте, что команда `db_load` заполняет связь произведений с жанрами, '
+            'которую использует фильтр `genre`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_db_load_rerun_and_resume(self, tmp_path):
+        from reviews.models import Review, Title
+
+        checkpoint = tmp_path / 'checkpoint.json'
+        call_command('db_load', path=DATA_DIR, checkpoint=str(checkpoint))
+        call_command('db_load', path=DATA_DIR, checkpoint=str(checkpoint))
+        assert Review.objects.count() == 72 and Title.genre.through.objects.count() == 42, (
+            'Проверьте, что повторный запуск `db_load` не создаёт дубликатов и не падает'
+        )
+        Review.objects.filter(pk__gt=50).delete()
+        checkpoint.write_text('{"review.csv": 40}')
+        call_command('db_load', path=DATA_DIR, checkpoint=str(checkpoint), resume=True)
+        assert Review.objects.count() == 72, (
+            'Проверьте, что `db_load --resume` продолжает импорт с сохранённой позиции'
+        )
+        assert not checkpoint.exists(), (
+            'Проверьте, что после успешного импорта файл прогресса удаляется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_db_load_parse_error(self, tmp_path):
+        from django.core.management.base import CommandError
+
+        for name in ('category', 'genre', 'users', 'titles', 'review', 'genre_title', 'comments'):
+            (tmp_path / f'{name}.csv').write_text('id,name,slug\n', encoding='utf-8')
+        (tmp_path / 'titles.csv').unlink()
+        with pytest.raises(CommandError):
+            call_command('db_load', path=str(tmp_path), workers=2,
+                         checkpoint=str(tmp_path / 'checkpoint.json'))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_db_dump_round_trip(self, tmp_path):
+        from reviews.dataset import FILE_MODEL
+
+        call_command('db_load', path=DATA_DIR, workers=1, checkpoint=str(tmp_path / 'checkpoint.json'))
+        call_command('db_dump', path=str(tmp_path / 'first'))
+        for model in FILE_MODEL.values():
+            model.objects.all().delete()
+        call_command('db_load', path=str(tmp_path / 'first'), workers=1,
+                     checkpoint=str(tmp_path / 'checkpoint.json'))
+        call_command('db_dump', path=str(tmp_path / 'second'))
+        for file_name in FILE_MODEL:
+            first = (tmp_path / 'first' / f'{file_name}.csv').read_text(encoding='utf-8')
+            second = (tmp_path / 'second' / f'{file_name}.csv').read_text(encoding='utf-8')
+            assert first == second, (
+                f'Проверьте, что выгрузка `db_dump` и повторная загрузка `db_load` '
+                f'не теряют данные в `{file_name}.csv`'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_export_endpoint(self, client, user_client, admin_client):
+        call_command('db_load', path=DATA_DIR, workers=1)
+        response = user_client.get('/api/v1/export/titles/')
+        assert response.status_code == 403, (
+            'Проверьте, что выгрузка `/api/v1/export/{file_name}/` доступна только администратору'
+        )
+        response = admin_client.get('/api/v1/export/titles/')
+        assert response.status_code == 200 and response.streaming, (
+            'Проверьте, что `/api/v1/export/{file_name}/` отдаёт потоковый ответ'
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'id,name,year,category,description' and len(lines) == 33
+        response = admin_client.get('/api/v1/export/review/?type=ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 72, (
+            'Проверьте, что `/api/v1/export/{file_name}/?type=ndjson` выгружает по строке на запись'
+        )
+        assert admin_client.get('/api/v1/export/nope/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_db_generate(self, client):
+        from reviews.models import Comment, Review, Title
+
+        options = dict(users=50, titles=40, reviews=500, comments=200, seed=7, batch_size=64)
+        call_command('db_generate', **options)
+        assert (Title.objects.count(), Review.objects.count(), Comment.objects.count()) == (40, 500, 200), (
+            'Проверьте, что `db_generate` создаёт заданное количество записей'
+        )
+        counts = list(Title.objects.order_by('pk').values_list('rating_count', flat=True))
+        assert counts[0] > counts[-1] and sum(counts) == 500, (
+            'Проверьте, что `db_generate` распределяет отзывы по произведениям неравномерно '
+            'и заполняет рейтинг'
+        )
+        assert client.get('/api/v1/titles/').status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_08_db_generate_without_titles(self):
+        from reviews.models import CustomUser, Review, Title
+
+        call_command('db_generate', users=5, titles=0, reviews=10, comments=10, seed=7)
+        assert (CustomUser.objects.count(), Title.objects.count(), Review.objects.count()) == (5, 0, 0), (
+            'Проверьте, что `db_generate` без произведений не создаёт отзывов и не падает'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_09_db_load_default_checkpoint(self, tmp_path):
+        import shutil
+
+        from reviews.models import Review
+
+        data = tmp_path / 'data'
+        shutil.copytree(DATA_DIR, data)
+        call_command('db_load', path=str(data), workers=1)
+        Review.objects.filter(pk__gt=50).delete()
+        checkpoint = data / '.db_load_checkpoint.json'
+        checkpoint.write_text('{"review.csv": 40}')
+        call_command('db_load', path=str(data), workers=1, resume=True)
+        assert Review.objects.count() == 72 and not checkpoint.exists(), (
+            'Проверьте, что по умолчанию файл прогресса `db_load` хранится в папке с .csv файлами'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_10_db_load_rejected_rows(self, tmp_path):
+        import csv
+        import shutil
+
+        from django.core.management.base import CommandError
+
+        from reviews.models import Review
+
+        for broken in ('blank_author', 'duplicate_review'):
+            data = tmp_path / broken
+            shutil.copytree(DATA_DIR, data)
+            with open(data / 'review.csv', encoding='utf-8') as review_file:
+                rows = list(csv.DictReader(review_file))
+            if broken == 'blank_author':
+                rows[5]['author'] = ''
+            else:
+                rows.append({**rows[0], 'id': '1000'})
+            with open(data / 'review.csv', 'w', encoding='utf-8', newline='') as review_file:
+                writer = csv.DictWriter(review_file, fieldnames=rows[0].keys())
+                writer.writeheader()
+                writer.writerows(rows)
+            with pytest.raises(CommandError, match='review.csv'):
+                call_command('db_load', path=str(data), workers=1)
+            assert Review.objects.count() == 0, (
+                'Проверьте, что `db_load` не пропускает молча строки, нарушающие ограничения'
+            )
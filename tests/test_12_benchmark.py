@@ -0,0 +1,40 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+class Test12Benchmark:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_benchmark_baseline(self, tmp_path, admin, moderator, user):
+        call_command('db_generate', users=30, titles=10, reviews=60, comments=30)
+        baseline = tmp_path / 'baseline.json'
+        call_command('api_benchmark', requests=2, warmup=0, output=str(baseline))
+        report = json.loads(baseline.read_text(encoding='utf-8'))
+        assert {'titles-list [anonymous]', 'comments-list [admin]'} <= set(report['results']), (
+            'Проверьте, что `api_benchmark` замеряет эндпоинты для всех ролей'
+        )
+        assert set(report['results']['titles-list [anonymous]']) >= {'p50', 'p95', 'p99', 'rps', 'queries'}
+        for result in report['results'].values():
+            result['queries'] = 0
+        baseline.write_text(json.dumps(report), encoding='utf-8')
+        with pytest.raises(CommandError):
+            call_command('api_benchmark', requests=2, warmup=0, compare=str(baseline), threshold=100)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_index_benchmark(self, capsys):
+        from django.db import connection
+
+        call_command('db_generate', users=30, titles=10, reviews=60, comments=30)
+        call_command('index_benchmark', repeat=1)
+        output = capsys.readouterr().out
+        assert 'USING INDEX comment_review_pub_date_idx' in output, (
+            'Проверьте, что `index_benchmark` показывает планы запросов с индексами'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name = 'comment_review_pub_date_idx'")
+            assert cursor.fetchall(), (
+                'Проверьте, что `index_benchmark` восстанавливает удалённые для сравнения индексы'
+            )
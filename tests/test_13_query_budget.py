@@ -0,0 +1,70 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def dataset():
+    from django.db.models import Count
+    from reviews.models import Review, Title
+
+    call_command('db_generate', users=150, titles=5, reviews=300, comments=300, seed=1)
+    title = Title.objects.order_by('-rating_count').first()
+    review = Review.objects.filter(title=title).annotate(
+        comment_count=Count('comments')).order_by('-comment_count').first()
+    return {
+        'title': title.pk,
+        'review': review.pk,
+        'comment': review.comments.first().pk,
+        'username': review.author.username,
+    }
+
+
+class Test13QueryBudget:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.query_budget(3)
+    def test_01_titles_list(self, client, dataset, query_budget):
+        query_budget.check(client, '/api/v1/titles/')
+        query_budget.check(client, '/api/v1/titles/?pagination=cursor')
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.query_budget(2)
+    def test_02_titles_detail(self, client, dataset, query_budget):
+        query_budget.check(client, f'/api/v1/titles/{dataset["title"]}/', page_sizes=(None,))
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.query_budget(3)
+    def test_03_reviews_list(self, client, dataset, query_budget):
+        query_budget.check(client, f'/api/v1/titles/{dataset["title"]}/reviews/')
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.query_budget(2)
+    def test_04_reviews_detail(self, client, dataset, query_budget):
+        query_budget.check(
+            client, f'/api/v1/titles/{dataset["title"]}/reviews/{dataset["review"]}/', page_sizes=(None,)
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.query_budget(3)
+    def test_05_comments_list(self, client, dataset, query_budget):
+        query_budget.check(client, f'/api/v1/titles/{dataset["title"]}/reviews/{dataset["review"]}/comments/')
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.query_budget(2)
+    def test_06_comments_detail(self, client, dataset, query_budget):
+        query_budget.check(
+            client,
+            f'/api/v1/titles/{dataset["title"]}/reviews/{dataset["review"]}/comments/{dataset["comment"]}/',
+            page_sizes=(None,)
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.query_budget(2)
+    def test_07_genres_categories_list(self, client, dataset, query_budget):
+        query_budget.check(client, '/api/v1/genres/')
+        query_budget.check(client, '/api/v1/categories/')
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.query_budget(3)
+    def test_08_users_list(self, admin_client, dataset, query_budget):
+        query_budget.check(admin_client, '/api/v1/users/')
@@ -0,0 +1,38 @@
+import re
+
+import pytest
+
+from .common import create_titles
+
+
+class Test14Metrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_metrics(self, client, user_client, admin_client):
+        from api.v1.metrics import registry
+
+        registry.clear()
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        response = user_client.get('/api/v1/metrics/')
+        assert response.status_code == 403, (
+            'Проверьте, что `/api/v1/metrics/` доступен только администратору'
+        )
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain'), (
+            'Проверьте, что `/api/v1/metrics/` отдаёт метрики в текстовом формате Prometheus'
+        )
+        text = response.content.decode()
+        labels = 'route="titles-list",method="GET"'
+        assert f'api_request_duration_seconds_count{{{labels}}} 1' in text, (
+            'Проверьте, что задержка запросов учитывается по имени маршрута'
+        )
+        assert f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        for name in ('api_sql_queries_total', 'api_serializer_duration_seconds_total',
+                     'api_response_bytes_total'):
+            value = re.search(rf'^{name}{{{labels}}} (\S+)$', text, re.MULTILINE)
+            assert value and float(value.group(1)) > 0, (
+                f'Проверьте, что метрика `{name}` собирается для `titles-list`'
+            )
+        assert 'api_responses_total{route="titles-list",method="POST",status="201"} 2' in text
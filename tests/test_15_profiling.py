@@ -0,0 +1,33 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test15Profiling:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_profile_modes(self, settings, tmp_path, client, user_client, admin_client):
+        settings.PROFILE_DIR = str(tmp_path)
+        create_titles(admin_client)
+        response = user_client.get('/api/v1/titles/?profile=inline')
+        assert 'results' in response.json() and not list(tmp_path.iterdir()), (
+            'Проверьте, что профилирование доступно только администратору'
+        )
+        response = admin_client.get('/api/v1/titles/?profile=inline')
+        text = response.content.decode()
+        assert response['Content-Type'].startswith('text/plain') and 'serialization' in text, (
+            'Проверьте, что `?profile=inline` возвращает отчёт профилировщика по этапам'
+        )
+        response = admin_client.get('/api/v1/titles/', HTTP_X_PROFILE='pstats')
+        assert 'results' in response.json(), (
+            'Проверьте, что при записи профиля в файл возвращается обычный ответ'
+        )
+        assert response['X-Profile-File'].endswith('.prof') and 'orm=' in response['X-Profile-Phases']
+        import pstats
+        pstats.Stats(response['X-Profile-File'])
+        response = admin_client.get('/api/v1/titles/', HTTP_X_PROFILE='collapsed')
+        with open(response['X-Profile-File'], encoding='utf-8') as profile_file:
+            lines = profile_file.read().splitlines()
+        assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines), (
+            'Проверьте, что `collapsed` профиль записан в формате `стек количество`'
+        )
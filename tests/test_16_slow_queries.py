@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_titles
+
+
+class Test16SlowQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_slow_query_log(self, settings, tmp_path, client, admin_client, capsys):
+        log = tmp_path / 'slow.log'
+        settings.SLOW_QUERY_LOG = str(log)
+        create_titles(admin_client)
+        settings.SLOW_QUERY_THRESHOLD = 0
+        client.get('/api/v1/titles/?name=Про')
+        client.get('/redoc/')
+        entries = [json.loads(line) for line in log.read_text(encoding='utf-8').splitlines()]
+        assert entries and {entry['view'] for entry in entries} == {'api:titles-list'}, (
+            'Проверьте, что в журнал попадают только запросы из представлений API'
+        )
+        entry = next(entry for entry in entries if 'LIKE' in entry['sql'])
+        assert entry['params'] and entry['plan'], (
+            'Проверьте, что запись журнала содержит параметры и план запроса'
+        )
+        capsys.readouterr()
+        call_command('slow_queries', log=str(log), top=1)
+        output = capsys.readouterr().out
+        assert output.startswith('1. ') and 'GET api:titles-list' in output and '2. ' not in output, (
+            'Проверьте, что `slow_queries` выводит самые медленные запросы'
+        )
+
+    @pytest.mark.django_db
+    def test_02_failures_not_masked(self, settings, tmp_path, rf):
+        from django.db import DatabaseError, connection
+
+        from api.v1.slow_queries import SlowQueryLogger, explain
+
+        connection.ensure_connection()
+        assert explain(connection, 'SELECT * FROM missing_table', ()) is None, (
+            'Проверьте, что ошибка EXPLAIN не прерывает запрос'
+        )
+        log = tmp_path / 'slow.log'
+        settings.SLOW_QUERY_LOG = str(log)
+        settings.SLOW_QUERY_THRESHOLD = 0
+
+        def execute(sql, params, many, context):
+            raise DatabaseError('boom')
+
+        with pytest.raises(DatabaseError, match='boom'):
+            SlowQueryLogger(rf.get('/api/v1/titles/'))(
+                execute, 'SELECT 1', (), False, {'connection': connection})
+        assert not log.exists(), (
+            'Проверьте, что запрос, завершившийся ошибкой, не попадает в журнал'
+        )
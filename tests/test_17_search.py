@@ -0,0 +1,67 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test17FullTextSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?search=драма')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?search=` возвращается статус 200'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [titles[1]['id']], (
+            'Проверьте, что полнотекстовый поиск находит произведение по описанию'
+        )
+        assert data['count'] == 1
+        data = client.get('/api/v1/titles/?search=ПОВО').json()
+        assert [title['id'] for title in data['results']] == [titles[0]['id']], (
+            'Проверьте, что поиск не зависит от регистра и находит слово по префиксу'
+        )
+        data = client.get('/api/v1/titles/?search=!!!').json()
+        assert data['count'] == 2, (
+            'Проверьте, что запрос без слов не ограничивает выдачу'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_search_ranking(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'description': 'Проект года'})
+        data = client.get('/api/v1/titles/?search=проект').json()
+        assert [title['id'] for title in data['results']] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что совпадение в названии ранжируется выше совпадения в описании'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_search_index_sync(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Разворот'})
+        data = client.get('/api/v1/titles/?search=поворот').json()
+        assert data['count'] == 0, (
+            'Проверьте, что после изменения названия старое название не находится'
+        )
+        data = client.get('/api/v1/titles/?search=разворот').json()
+        assert [title['id'] for title in data['results']] == [titles[0]['id']], (
+            'Проверьте, что после изменения названия находится новое название'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        data = client.get('/api/v1/titles/?search=разворот').json()
+        assert data['count'] == 0, (
+            'Проверьте, что удалённое произведение не находится поиском'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_reviews_search(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = client.get(f'{url}?search=qwerty123').json()
+        assert [review['id'] for review in data['results']] == [reviews[1]['id']], (
+            'Проверьте, что полнотекстовый поиск работает для отзывов'
+        )
+        data = client.get(f'/api/v1/titles/{titles[1]["id"]}/reviews/?search=qwerty123').json()
+        assert data['count'] == 0, (
+            'Проверьте, что поиск по отзывам ограничен отзывами произведения'
+        )
@@ -0,0 +1,107 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test18Autocomplete:
+    url = '/api/v1/autocomplete/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_prefix(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(f'{self.url}?q=ПОВ')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/autocomplete/` возвращается статус 200'
+        )
+        assert response.json()['results'] == [{'id': titles[0]['id'], 'name': titles[0]['name']}], (
+            'Проверьте, что автодополнение находит произведение по началу названия без учёта регистра'
+        )
+        assert client.get(f'{self.url}?q=туда').json()['results'] == [], (
+            'Проверьте, что автодополнение ищет только по началу названия'
+        )
+        assert client.get(self.url).json()['results'] == []
+        response = client.get(f'{self.url}?q=п&type=unknown')
+        assert response.status_code == 400, (
+            'Проверьте, что при неизвестном `type` возвращается статус 400'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_incremental_update(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert len(client.get(f'{self.url}?q=п').json()['results']) == 2
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Разворот'})
+        data = {'name': 'Побег', 'year': 1999, 'genre': [], 'category': titles[0]['category']}
+        new_title = admin_client.post('/api/v1/titles/', data=data).json()
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        results = client.get(f'{self.url}?q=п').json()['results']
+        assert results == [{'id': new_title['id'], 'name': 'Побег'}], (
+            'Проверьте, что индекс автодополнения обновляется при изменении, создании и удалении произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_ranking_and_limit(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        data = {'name': 'Поворот обратно', 'year': 2001, 'genre': [], 'category': titles[0]['category']}
+        new_title = admin_client.post('/api/v1/titles/', data=data).json()
+        results = client.get(f'{self.url}?q=пов').json()['results']
+        assert [title['id'] for title in results] == [titles[0]['id'], new_title['id']], (
+            'Проверьте, что автодополнение упорядочивает произведения по рейтингу'
+        )
+        admin_client.post(f'/api/v1/titles/{new_title["id"]}/reviews/', data={'text': 'Шедевр', 'score': 10})
+        results = client.get(f'{self.url}?q=пов').json()['results']
+        assert [title['id'] for title in results] == [new_title['id'], titles[0]['id']], (
+            'Проверьте, что порядок подсказок обновляется при изменении рейтинга'
+        )
+        assert len(client.get(f'{self.url}?q=пов&limit=1').json()['results']) == 1, (
+            'Проверьте, что параметр `limit` ограничивает количество подсказок'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_genres_by_popularity(self, client, admin_client):
+        _, _, genres = create_titles(admin_client)
+        results = client.get(f'{self.url}?type=genres&q=').json()['results']
+        assert results == []
+        prefix = genres[0]['name'][0]
+        results = client.get(f'{self.url}?type=genres&q={prefix}').json()['results']
+        assert {'name': genres[0]['name'], 'slug': genres[0]['slug']} in results, (
+            'Проверьте, что автодополнение работает для жанров'
+        )
+
+    def test_05_short_prefix_top(self):
+        import random
+
+        from api.v1.autocomplete import PrefixIndex
+
+        rng = random.Random(18)
+        names = ['аа', 'аб', 'ав', 'ба', 'бб', 'а', 'ааа', 'абв', 'в']
+        rows = {pk: (rng.choice(names), (rng.randint(0, 5),)) for pk in range(40)}
+        index = PrefixIndex(
+            lambda limit: [(pk, name, score, pk) for pk, (name, score) in rows.items()],
+            max_entries=100, prefix_length=2, top_size=3)
+
+        def expected(prefix, limit):
+            matching = [pk for pk, (name, _) in rows.items() if name.startswith(prefix)]
+            return sorted(matching, key=lambda pk: (-rows[pk][1][0], rows[pk][0], pk))[:limit]
+
+        index.load()
+        for _ in range(300):
+            pk = rng.randrange(50)
+            action = rng.random()
+            if action < 0.3:
+                rows.pop(pk, None)
+                index.remove(pk)
+            elif action < 0.6 and pk in rows:
+                rows[pk] = (rows[pk][0], (rng.randint(0, 5),))
+                index.update_score(pk, rows[pk][1])
+            else:
+                rows[pk] = (rng.choice(names), (rng.randint(0, 5),))
+                index.update(pk, rows[pk][0], rows[pk][1], pk)
+            for prefix in ('а', 'б', 'в', 'аа', 'аб', 'ба'):
+                assert index.lookup(prefix, 3) == expected(prefix, 3), (
+                    'Проверьте, что лучшие результаты для коротких префиксов '
+                    'обновляются инкрементально и совпадают с полным перебором'
+                )
+        index._scan = None
+        assert index.lookup('аб', 2) == expected('аб', 2), (
+            'Проверьте, что короткие префиксы обслуживаются без перебора ключей'
+        )
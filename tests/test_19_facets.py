@@ -0,0 +1,78 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test19Facets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_facets(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?facets=genre,category,year')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?facets=` возвращается статус 200'
+        )
+        facets = response.json()['facets']
+        assert sorted(facets['genre'], key=lambda item: item['slug']) == sorted([
+            {'slug': genre['slug'], 'name': genre['name'], 'count': 1} for genre in genres
+        ], key=lambda item: item['slug']), (
+            'Проверьте, что фасет `genre` содержит количество произведений каждого жанра'
+        )
+        assert sorted(facets['category'], key=lambda item: item['slug']) == sorted([
+            {'slug': category['slug'], 'name': category['name'], 'count': 1} for category in categories[:2]
+        ], key=lambda item: item['slug']), (
+            'Проверьте, что фасет `category` содержит количество произведений каждой категории'
+        )
+        assert facets['year'] == [
+            {'from': 2000, 'to': 2009, 'count': 1},
+            {'from': 2020, 'to': 2029, 'count': 1},
+        ], (
+            'Проверьте, что фасет `year` группирует произведения по десятилетиям'
+        )
+        assert 'facets' not in client.get('/api/v1/titles/').json(), (
+            'Проверьте, что фасеты возвращаются только по запросу'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_facets_follow_filters(self, client, admin_client, django_assert_max_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/?genre={genres[0]["slug"]}&facets=genre,year'
+        with django_assert_max_num_queries(4):
+            response = client.get(url)
+        facets = response.json()['facets']
+        assert sorted(item['slug'] for item in facets['genre']) == sorted(
+            titles[0]['genre']
+        ), (
+            'Проверьте, что фасеты считаются по отфильтрованным произведениям, '
+            'включая все жанры найденных произведений'
+        )
+        assert facets['year'] == [{'from': 2000, 'to': 2009, 'count': 1}]
+        assert 'category' not in facets
+        facets = client.get('/api/v1/titles/?search=драма&facets=category').json()['facets']
+        assert facets['category'] == [{'slug': categories[1]['slug'], 'name': categories[1]['name'], 'count': 1}], (
+            'Проверьте, что фасеты учитывают полнотекстовый поиск'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_facets_with_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?search=драма&facets=genre,category,year')
+        assert response.status_code == 200, (
+            'Проверьте, что фасеты можно запрашивать вместе с полнотекстовым поиском'
+        )
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [titles[1]['id']]
+        assert sorted(item['slug'] for item in data['facets']['genre']) == sorted(titles[1]['genre']), (
+            'Проверьте, что фасет `genre` учитывает полнотекстовый поиск'
+        )
+        assert data['facets']['category'] == [
+            {'slug': categories[1]['slug'], 'name': categories[1]['name'], 'count': 1}
+        ]
+        assert data['facets']['year'] == [{'from': 2020, 'to': 2029, 'count': 1}]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_unknown_facet(self, client):
+        response = client.get('/api/v1/titles/?facets=author')
+        assert response.status_code == 400, (
+            'Проверьте, что при запросе неизвестного фасета возвращается статус 400'
+        )
@@ -0,0 +1,90 @@
+from base64 import b64encode
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from .common import create_reviews
+
+
+def create_rated_titles(admin_client, admin):
+    _, titles, _, _ = create_reviews(admin_client, admin)
+    admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Отлично', 'score': 9})
+    data = {'name': 'Апрель', 'year': 2010, 'genre': [], 'category': titles[0]['category']}
+    titles.append(admin_client.post('/api/v1/titles/', data=data).json())
+    return titles
+
+
+class Test20Ordering:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ordering(self, client, admin_client, admin):
+        titles = create_rated_titles(admin_client, admin)
+        cases = {
+            '-rating': [titles[1]['id'], titles[0]['id'], titles[2]['id']],
+            'rating': [titles[2]['id'], titles[0]['id'], titles[1]['id']],
+            'year': [titles[0]['id'], titles[2]['id'], titles[1]['id']],
+            'name': [titles[2]['id'], titles[0]['id'], titles[1]['id']],
+            '-reviews,name': [titles[0]['id'], titles[1]['id'], titles[2]['id']],
+        }
+        for ordering, expected in cases.items():
+            response = client.get(f'/api/v1/titles/?ordering={ordering}')
+            assert response.status_code == 200, (
+                'Проверьте, что при GET запросе `/api/v1/titles/?ordering=` возвращается статус 200'
+            )
+            assert [title['id'] for title in response.json()['results']] == expected, (
+                f'Проверьте, что `ordering={ordering}` упорядочивает произведения'
+            )
+        response = client.get('/api/v1/titles/?ordering=description')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id'], titles[2]['id'], titles[1]['id']
+        ], (
+            'Проверьте, что недопустимое поле в `ordering` игнорируется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ordering_with_cursor(self, client, admin_client, admin):
+        create_rated_titles(admin_client, admin)
+        for ordering in ('-rating', 'rating', '-reviews', 'name'):
+            expected = [
+                title['id'] for title in client.get(f'/api/v1/titles/?ordering={ordering}').json()['results']
+            ]
+            received = []
+            next_url = f'/api/v1/titles/?ordering={ordering}&pagination=cursor&limit=1'
+            while next_url:
+                data = client.get(next_url).json()
+                received.extend(title['id'] for title in data['results'])
+                next_url = data['next']
+            assert received == expected, (
+                f'Проверьте, что постраничный вывод по курсору с `ordering={ordering}` '
+                'возвращает произведения в том же порядке без пропусков и повторов'
+            )
+            previous_url = data['previous']
+            data = client.get(previous_url).json()
+            assert [title['id'] for title in data['results']] == expected[-2:-1], (
+                'Проверьте, что ссылка `previous` при упорядочивании ведёт на предыдущую страницу'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalid_cursor(self, client, admin_client, admin):
+        create_rated_titles(admin_client, admin)
+        cursor = b64encode(b'p=notjson').decode()
+        response = client.get(f'/api/v1/titles/?pagination=cursor&cursor={cursor}')
+        assert response.status_code == 404, (
+            'Проверьте, что подделанный курсор возвращает статус 404'
+        )
+        next_url = client.get('/api/v1/titles/?ordering=name&pagination=cursor&limit=1').json()['next']
+        cursor = parse_qs(urlparse(next_url).query)['cursor'][0]
+        response = client.get(f'/api/v1/titles/?ordering=-rating&pagination=cursor&cursor={cursor}')
+        assert response.status_code == 404, (
+            'Проверьте, что курсор, полученный с другим `ordering`, возвращает статус 404'
+        )
+
+    @pytest.mark.django_db
+    def test_04_ordering_indexes(self):
+        from reviews.models import Title
+
+        for ordering in (('-rating', '-id'), ('-rating_count', '-id'), ('name', 'id'), ('year', 'id')):
+            plan = Title.objects.order_by(*ordering)[:20].explain()
+            assert 'USING INDEX' in plan and 'TEMP B-TREE' not in plan, (
+                f'Проверьте, что сортировка по {ordering[0]} использует индекс: {plan}'
+            )
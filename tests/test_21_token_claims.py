@@ -0,0 +1,82 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .common import create_titles
+
+
+def token_client(client, user):
+    from reviews.confirmation import issue_code
+    from reviews.models import ConfirmationCode
+
+    ConfirmationCode.objects.filter(user=user).delete()
+    code = issue_code(type(user).objects.get(pk=user.pk))
+    response = client.post('/api/v1/auth/token/', data={'username': user.username, 'confirmation_code': code})
+    assert response.status_code == 200, (
+        'Проверьте, что при POST запросе `/api/v1/auth/token/` с верным кодом возвращается статус 200'
+    )
+    token_client = APIClient()
+    token_client.credentials(HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+    return token_client
+
+
+class Test21TokenClaims:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_user_query(self, client, admin_client, user, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        user_client = token_client(client, user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client.get(url)
+        client.get(url)
+        with django_assert_num_queries(2) as context:
+            response = user_client.get(url)
+        assert response.status_code == 200
+        assert all('reviews_customuser' not in query['sql'] for query in context.captured_queries), (
+            'Проверьте, что при аутентификации по токену с claims пользователь не загружается из базы'
+        )
+        response = user_client.post(url, data={'text': 'Неплохо', 'score': 7})
+        assert response.status_code == 201, (
+            'Проверьте, что пользователь с токеном с claims может оставить отзыв'
+        )
+        assert response.json()['author'] == user.username
+        response = user_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `/api/v1/users/me/` возвращает данные пользователя из базы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_role_change_revokes_token(self, client, admin_client, user):
+        user_client = token_client(client, user)
+        assert user_client.get('/api/v1/users/').status_code == 403
+        response = admin_client.patch(f'/api/v1/users/{user.username}/', data={'role': 'admin'})
+        assert response.status_code == 200
+        assert user_client.get('/api/v1/users/').status_code == 401, (
+            'Проверьте, что после смены роли старый токен отзывается'
+        )
+        user.refresh_from_db()
+        assert token_client(client, user).get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что новый токен содержит актуальную роль'
+        )
+        response = admin_client.patch(f'/api/v1/users/{user.username}/', data={'bio': 'Новое'})
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.token_version == 1, (
+            'Проверьте, что изменение полей, не входящих в токен, не отзывает токены'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rename_revokes_token(self, client, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        user_client = token_client(client, user)
+        response = user_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        assert response.status_code == 200
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = user_client.post(url, data={'text': 'Неплохо', 'score': 7})
+        assert response.status_code == 401, (
+            'Проверьте, что после смены имени пользователя старый токен отзывается'
+        )
+        user.refresh_from_db()
+        response = token_client(client, user).post(url, data={'text': 'Неплохо', 'score': 7})
+        assert response.json()['author'] == 'renamed', (
+            'Проверьте, что новый токен содержит актуальное имя пользователя'
+        )
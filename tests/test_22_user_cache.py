@@ -0,0 +1,71 @@
+import pytest
+
+from .common import auth_client
+
+
+class Test22UserCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_lru(self, user, moderator, admin, django_assert_num_queries):
+        from api.v1.user_cache import UserCache
+
+        cache = UserCache(2)
+        with django_assert_num_queries(1):
+            users = cache.get_many([user.pk, moderator.pk])
+        assert users[user.pk].username == user.username
+        assert users[moderator.pk].role == moderator.role
+        with django_assert_num_queries(0):
+            cache.get(user.pk)
+        with django_assert_num_queries(1):
+            cache.get(admin.pk)
+        assert list(cache.users) == [user.pk, admin.pk], (
+            'Проверьте, что кеш пользователей вытесняет давно не использованные записи'
+        )
+        assert cache.get(-1) is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_authentication_uses_cache(self, user, django_assert_num_queries):
+        client = auth_client(user)
+        client.get('/api/v1/users/me/')
+        with django_assert_num_queries(1) as context:
+            response = client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+        assert response.json()['username'] == user.username
+        assert len(context.captured_queries) == 1, (
+            'Проверьте, что при повторной аутентификации пользователь берётся из кеша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalidation(self, admin_client, user):
+        from api.v1.user_cache import user_cache
+
+        client = auth_client(user)
+        assert client.get('/api/v1/users/').status_code == 403
+        assert user.pk in user_cache.users
+        response = admin_client.patch(f'/api/v1/users/{user.username}/', data={'role': 'admin'})
+        assert response.status_code == 200
+        assert user.pk not in user_cache.users, (
+            'Проверьте, что изменение пользователя сбрасывает его запись в кеше'
+        )
+        assert client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что после изменения роли аутентификация видит новую роль'
+        )
+        client.patch('/api/v1/users/me/', data={'first_name': 'Иван'})
+        assert user.pk not in user_cache.users, (
+            'Проверьте, что изменение профиля через `/users/me/` сбрасывает запись в кеше'
+        )
+
+    @pytest.mark.django_db
+    def test_04_unsaved_author_not_cached(self, user):
+        from api.v1.serializers import AuthorField
+        from api.v1.user_cache import user_cache
+        from reviews.models import CustomUser, Review
+
+        author = CustomUser(pk=user.pk, username='claims', role=user.role)
+        review = Review(author=author)
+        assert AuthorField().get_attribute(review) == user.username, (
+            'Проверьте, что автор, не загруженный из базы, определяется по `author_id`'
+        )
+        assert user_cache.users[user.pk].username == user.username, (
+            'Проверьте, что в кеш попадают только пользователи, загруженные из базы'
+        )
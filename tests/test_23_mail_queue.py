@@ -0,0 +1,76 @@
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.management import call_command
+
+
+class Test23MailQueue:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues_mail(self, client):
+        from reviews.models import OutgoingMail
+
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что при регистрации письмо не отправляется во время запроса'
+        )
+        queued = OutgoingMail.objects.get()
+        assert queued.recipient == data['email'] and queued.sent is None, (
+            'Проверьте, что при регистрации письмо ставится в очередь исходящей почты'
+        )
+        call_command('mail_worker', once=True)
+        assert [message.to for message in mail.outbox] == [[data['email']]], (
+            'Проверьте, что команда `mail_worker` отправляет письма из очереди'
+        )
+        queued.refresh_from_db()
+        assert queued.sent is not None and queued.attempts == 1
+        call_command('mail_worker', once=True)
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленные письма не отправляются повторно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batches_share_connection(self):
+        from reviews.outbox import OutboxWorker, enqueue_mail
+
+        for index in range(5):
+            enqueue_mail('Тема', 'Текст', f'user{index}@yamdb.fake')
+        worker = OutboxWorker(batch_size=2)
+        with mock.patch('reviews.outbox.get_connection', wraps=get_connection) as connection_factory:
+            assert worker.drain() == (5, 0)
+        assert connection_factory.call_count == 1, (
+            'Проверьте, что все пачки писем отправляются через одно соединение'
+        )
+        assert len(mail.outbox) == 5
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_retry_with_backoff(self):
+        from django.utils import timezone
+        from reviews.models import OutgoingMail
+        from reviews.outbox import OutboxWorker, enqueue_mail
+
+        queued = enqueue_mail('Тема', 'Текст', 'retry@yamdb.fake')
+        worker = OutboxWorker(max_attempts=2, backoff=60)
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP недоступен')):
+            assert worker.drain() == (0, 1)
+        queued.refresh_from_db()
+        assert queued.attempts == 1 and 'SMTP недоступен' in queued.last_error
+        assert queued.next_attempt > timezone.now(), (
+            'Проверьте, что после ошибки повторная отправка откладывается'
+        )
+        assert worker.drain() == (0, 0), (
+            'Проверьте, что письмо не отправляется повторно до истечения задержки'
+        )
+        OutgoingMail.objects.update(next_attempt=timezone.now())
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP недоступен')):
+            assert worker.drain() == (0, 1)
+        OutgoingMail.objects.update(next_attempt=timezone.now())
+        assert worker.drain() == (0, 0), (
+            'Проверьте, что после исчерпания попыток письмо больше не отправляется'
+        )
+        assert len(mail.outbox) == 0
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+
+
+class Test24ConfirmationCode:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    def signup(self, client):
+        from reviews.models import CustomUser, OutgoingMail
+
+        data = {'email': 'code@yamdb.fake', 'username': 'code_user'}
+        assert client.post(self.url_signup, data=data).status_code == 200
+        code = OutgoingMail.objects.get().message.split(': ')[1]
+        return CustomUser.objects.get(username=data['username']), code
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_code_is_hashed(self, client):
+        user, code = self.signup(client)
+        stored = user.confirmation_code
+        assert code not in stored.code_hash, (
+            'Проверьте, что код подтверждения хранится в виде хеша'
+        )
+        response = client.post(self.url_token, data={'username': user.username, 'confirmation_code': code})
+        assert response.status_code == 200 and 'token' in response.json(), (
+            'Проверьте, что по коду из письма выдаётся токен'
+        )
+        response = client.post(self.url_token, data={'username': user.username, 'confirmation_code': code})
+        assert response.status_code == 400, (
+            'Проверьте, что код подтверждения одноразовый'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_wrong_code_does_not_resend(self, client, django_assert_max_num_queries):
+        from reviews.models import OutgoingMail
+
+        user, code = self.signup(client)
+        for _ in range(3):
+            with django_assert_max_num_queries(2):
+                response = client.post(self.url_token, data={'username': user.username, 'confirmation_code': 'x'})
+            assert response.status_code == 400
+        assert OutgoingMail.objects.count() == 1, (
+            'Проверьте, что при неверном коде новый код не генерируется и не отправляется'
+        )
+        user.confirmation_code.refresh_from_db()
+        assert user.confirmation_code.attempts == 3, (
+            'Проверьте, что неверные попытки ввода кода подсчитываются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_lock_and_cooldown(self, client, settings, django_assert_max_num_queries):
+        from reviews.models import ConfirmationCode, OutgoingMail
+
+        settings.CONFIRMATION_CODE_MAX_ATTEMPTS = 2
+        user, code = self.signup(client)
+        for _ in range(2):
+            client.post(self.url_token, data={'username': user.username, 'confirmation_code': 'x'})
+        for _ in range(5):
+            with django_assert_max_num_queries(1):
+                response = client.post(self.url_token, data={'username': user.username, 'confirmation_code': code})
+            assert response.status_code == 400, (
+                'Проверьте, что после исчерпания попыток код не принимается'
+            )
+        assert OutgoingMail.objects.count() == 1, (
+            'Проверьте, что новый код не отправляется чаще, чем позволяет пауза между отправками'
+        )
+        ConfirmationCode.objects.update(created=user.confirmation_code.created - timedelta(hours=1))
+        response = client.post(self.url_token, data={'username': user.username, 'confirmation_code': code})
+        assert response.status_code == 400
+        assert OutgoingMail.objects.count() == 2, (
+            'Проверьте, что после паузы пользователю отправляется новый код'
+        )
+        call_command('mail_worker', once=True)
+        new_code = OutgoingMail.objects.latest('id').message.split(': ')[1]
+        response = client.post(self.url_token, data={'username': user.username, 'confirmation_code': new_code})
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_expired_code(self, client):
+        from reviews.models import ConfirmationCode
+
+        user, code = self.signup(client)
+        expires = user.confirmation_code.created - timedelta(seconds=1)
+        ConfirmationCode.objects.update(expires=expires, created=expires - timedelta(hours=1))
+        response = client.post(self.url_token, data={'username': user.username, 'confirmation_code': code})
+        assert response.status_code == 400, (
+            'Проверьте, что просроченный код не принимается'
+        )
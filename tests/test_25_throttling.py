@@ -0,0 +1,114 @@
+from unittest import mock
+
+import pytest
+
+from .common import auth_client, create_titles
+
+
+def set_rates(settings, **rates):
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {
+            **settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates
+        },
+    }
+
+
+class Test25Throttling:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_throttle(self, client, settings):
+        from reviews.models import CustomUser
+
+        set_rates(settings, signup='2/hour')
+        for index in range(2):
+            data = {'email': f'user{index}@yamdb.fake', 'username': f'user{index}'}
+            assert client.post('/api/v1/auth/signup/', data=data).status_code == 200
+        data = {'email': 'user2@yamdb.fake', 'username': 'user2'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == 429, (
+            'Проверьте, что частые регистрации с одного IP ограничиваются статусом 429'
+        )
+        assert int(response['Retry-After']) > 0
+        assert not CustomUser.objects.filter(username='user2').exists()
+        response = client.post('/api/v1/auth/signup/', data=data, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == 200, (
+            'Проверьте, что ограничение регистрации действует для каждого IP отдельно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_forwarded_for_ignored(self, client, settings):
+        set_rates(settings, signup='2/hour')
+        statuses = []
+        for index in range(3):
+            data = {'email': f'user{index}@yamdb.fake', 'username': f'user{index}'}
+            response = client.post('/api/v1/auth/signup/', data=data, HTTP_X_FORWARDED_FOR=f'10.1.0.{index}')
+            statuses.append(response.status_code)
+        assert statuses == [200, 200, 429], (
+            'Проверьте, что ограничение по IP нельзя обойти заголовком `X-Forwarded-For`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_token_throttle(self, client, settings):
+        set_rates(settings, token='1/minute')
+        data = {'username': 'unexisting_user', 'confirmation_code': 12345}
+        assert client.post('/api/v1/auth/token/', data=data).status_code == 404
+        assert client.post('/api/v1/auth/token/', data=data).status_code == 429, (
+            'Проверьте, что частые запросы `/api/v1/auth/token/` ограничиваются статусом 429'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_write_throttle(self, admin_client, settings, user, moderator):
+        titles, _, _ = create_titles(admin_client)
+        set_rates(settings, write='1/minute')
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client = auth_client(user)
+        assert user_client.post(url, data={'text': 'Текст', 'score': 5}).status_code == 201
+        response = user_client.post(url, data={'text': 'Текст', 'score': 5}, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == 429, (
+            'Проверьте, что публикация отзывов ограничивается для пользователя независимо от IP'
+        )
+        assert user_client.get(url).status_code == 200, (
+            'Проверьте, что чтение отзывов не ограничивается'
+        )
+        response = auth_client(moderator).post(url, data={'text': 'Текст', 'score': 5})
+        assert response.status_code == 429, (
+            'Проверьте, что публикация отзывов ограничивается для IP'
+        )
+        response = auth_client(moderator).post(url, data={'text': 'Текст', 'score': 5}, REMOTE_ADDR='10.0.0.3')
+        assert response.status_code == 201
+
+    def test_05_token_bucket_refill(self):
+        from api.v1.throttling import MemoryBuckets
+
+        buckets = MemoryBuckets(max_keys=2)
+        with mock.patch('api.v1.throttling.time.monotonic', return_value=100.0) as monotonic:
+            assert buckets.consume('a', 2, 1.0) is None
+            assert buckets.consume('a', 2, 1.0) is None
+            assert buckets.consume('a', 2, 1.0) == pytest.approx(1.0), (
+                'Проверьте, что при пустом ведре возвращается время ожидания следующего токена'
+            )
+            monotonic.return_value = 100.5
+            assert buckets.consume('a', 2, 1.0) == pytest.approx(0.5)
+            monotonic.return_value = 101.0
+            assert buckets.consume('a', 2, 1.0) is None, (
+                'Проверьте, что токены восстанавливаются со временем'
+            )
+            buckets.consume('b', 2, 1.0)
+            buckets.consume('c', 2, 1.0)
+        assert list(buckets.buckets) == ['b', 'c'], (
+            'Проверьте, что количество хранимых ключей ограничено'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_shared_cache_backend(self, client, settings):
+        from django.core.cache import caches
+
+        settings.THROTTLE_CACHE = 'default'
+        set_rates(settings, token='1/minute')
+        data = {'username': 'unexisting_user', 'confirmation_code': 12345}
+        assert client.post('/api/v1/auth/token/', data=data).status_code == 404
+        assert client.post('/api/v1/auth/token/', data=data).status_code == 429, (
+            'Проверьте, что ограничение работает с общим бэкендом кеша'
+        )
+        caches['default'].clear()